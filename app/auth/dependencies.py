@@ -1,6 +1,7 @@
 from fastapi import Depends, HTTPException, status, Request
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
+from app.auth.identity_cache import identity_cache
 from app.config import config
 from app.database.models import User
 
@@ -23,7 +24,13 @@ async def get_current_user(request: Request, token: str = Depends(oauth2_scheme)
     except JWTError:
         raise credentials_exception
 
+    cached_user = identity_cache.get(token, user_id)
+    if cached_user is not None:
+        return cached_user
+
     user = await User.get_or_none(id=user_id)
     if user is None:
         raise credentials_exception
+
+    identity_cache.set(token, user, exp=payload.get("exp"))
     return user
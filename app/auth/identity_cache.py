@@ -0,0 +1,99 @@
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from app.config import config
+from app.database.models import User
+
+
+class IdentityCache:
+    """
+    LRU cache of users resolved from verified access tokens.
+
+    Entries are keyed by the verified token together with its ``sub`` and
+    expire after ``ttl`` seconds or at the token's ``exp``, whichever comes
+    first. Only the
+    user's column values are kept; every hit gets its own ``User`` instance so
+    requests never share (or mutate) one ORM object.
+    """
+
+    def __init__(self, max_size: int, ttl: int):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple[str, int], tuple[float, dict]] = OrderedDict()
+        self._keys_by_user: dict[int, set[tuple[str, int]]] = {}
+
+    def get(self, token: str, user_id: int) -> Optional[User]:
+        key = (token, user_id)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, values = entry
+        if expires_at <= time.time():
+            self._drop(key)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        user = User(**values)
+        user._saved_in_db = True
+        return user
+
+    def set(self, token: str, user: User, exp: Optional[float] = None):
+        if self.max_size <= 0:
+            return
+
+        expires_at = time.time() + self.ttl
+        if exp is not None:
+            expires_at = min(expires_at, exp)
+
+        key = (token, user.id)
+        values = {name: getattr(user, name) for name in user._meta.fields_db_projection}
+        self._entries[key] = (expires_at, values)
+        self._entries.move_to_end(key)
+        self._keys_by_user.setdefault(user.id, set()).add(key)
+
+        while len(self._entries) > self.max_size:
+            self._drop(next(iter(self._entries)))
+
+    def invalidate_user(self, user_id: int):
+        for key in self._keys_by_user.pop(user_id, set()):
+            self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+        self._keys_by_user.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+        }
+
+    def _drop(self, key: tuple[str, int]):
+        if self._entries.pop(key, None) is None:
+            return
+
+        user_id = key[1]
+        keys = self._keys_by_user.get(user_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_user[user_id]
+
+
+identity_cache = IdentityCache(
+    max_size=config.IDENTITY_CACHE_SIZE,
+    ttl=config.IDENTITY_CACHE_TTL_SECONDS,
+)
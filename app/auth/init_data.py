@@ -0,0 +1,122 @@
+import hashlib
+import hmac
+import json
+import time
+from collections import OrderedDict
+from operator import itemgetter
+from urllib.parse import parse_qsl
+
+from aiogram.utils.web_app import WebAppInitData
+from pydantic import ValidationError
+
+from app.config import config
+
+
+class InvalidInitData(Exception):
+    pass
+
+
+class InvalidInitDataSignature(Exception):
+    pass
+
+
+class ExpiredInitData(Exception):
+    pass
+
+
+class InitDataValidator:
+    """
+    Validates Telegram WebApp init data against a secret derived once from
+    the bot token.
+
+    Accepted payloads are remembered by their ``hash`` until their
+    ``auth_date`` leaves the ``max_age`` window, so repeated logins with the
+    same init data skip the HMAC check and the model parsing.
+    """
+
+    def __init__(self, bot_token: str, max_age: int, cache_size: int):
+        self.max_age = max_age
+        self.cache_size = cache_size
+        self._secret_key = hmac.new(
+            key=b"WebAppData", msg=bot_token.encode(), digestmod=hashlib.sha256
+        ).digest()
+        self._accepted: OrderedDict[str, tuple[str, float, WebAppInitData]] = OrderedDict()
+
+    def validate(self, init_data: str) -> WebAppInitData:
+        try:
+            fields = dict(parse_qsl(init_data, strict_parsing=True))
+        except ValueError:
+            raise InvalidInitData("Init data is not a valid query string")
+
+        hash_ = fields.pop("hash", None)
+        if not hash_:
+            raise InvalidInitData("Init data has no hash")
+
+        now = time.time()
+        cached = self._accepted.get(hash_)
+        if cached is not None:
+            cached_init_data, expires_at, data = cached
+            if cached_init_data == init_data and expires_at > now:
+                self._accepted.move_to_end(hash_)
+                return data
+            del self._accepted[hash_]
+
+        try:
+            auth_date = int(fields["auth_date"])
+        except (KeyError, ValueError):
+            raise InvalidInitData("Init data has no valid auth_date")
+
+        expires_at = auth_date + self.max_age
+        if expires_at <= now:
+            raise ExpiredInitData("Init data is expired")
+
+        if not self.check_signature(fields, hash_):
+            raise InvalidInitDataSignature("Init data signature mismatch")
+
+        data = self._parse(fields, hash_)
+        self._remember(hash_, init_data, expires_at, data)
+        return data
+
+    def check_signature(self, fields: dict, hash_: str) -> bool:
+        data_check_string = "\n".join(
+            f"{key}={value}" for key, value in sorted(fields.items(), key=itemgetter(0))
+        )
+        calculated_hash = hmac.new(
+            key=self._secret_key, msg=data_check_string.encode(), digestmod=hashlib.sha256
+        ).hexdigest()
+        return hmac.compare_digest(calculated_hash, hash_)
+
+    def clear(self):
+        self._accepted.clear()
+
+    @staticmethod
+    def _parse(fields: dict, hash_: str) -> WebAppInitData:
+        result = {"hash": hash_}
+        for key, value in fields.items():
+            if (value.startswith("[") and value.endswith("]")) or (value.startswith("{") and value.endswith("}")):
+                try:
+                    value = json.loads(value)
+                except ValueError:
+                    raise InvalidInitData(f"Init data field {key} is not valid JSON")
+            result[key] = value
+
+        try:
+            return WebAppInitData(**result)
+        except ValidationError:
+            raise InvalidInitData("Init data does not match the WebApp schema")
+
+    def _remember(self, hash_: str, init_data: str, expires_at: float, data: WebAppInitData):
+        if self.cache_size <= 0:
+            return
+
+        self._accepted[hash_] = (init_data, expires_at, data)
+        self._accepted.move_to_end(hash_)
+        while len(self._accepted) > self.cache_size:
+            self._accepted.popitem(last=False)
+
+
+init_data_validator = InitDataValidator(
+    bot_token=config.TG_BOT_TOKEN,
+    max_age=config.INIT_DATA_MAX_AGE_SECONDS,
+    cache_size=config.INIT_DATA_CACHE_SIZE,
+)
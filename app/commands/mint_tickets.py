@@ -0,0 +1,35 @@
+"""
+Mints tickets for a lottery from its ticket template.
+
+    python -m app.commands.mint_tickets --lottery-id ID --count N [--batch-size SIZE]
+"""
+import argparse
+
+from tortoise import Tortoise, run_async
+
+from app.config import TORTOISE_ORM, config
+from app.services.minting_service import mint_tickets
+
+
+def print_progress(minted: int, total: int):
+    print(f"\r{minted}/{total} tickets minted", end="", flush=True)
+
+
+async def main(lottery_id: int, count: int, batch_size: int):
+    await Tortoise.init(config=TORTOISE_ORM)
+
+    result = await mint_tickets(lottery_id, count, batch_size=batch_size, progress=print_progress)
+    print()
+    print(
+        f"lottery {result['lottery_id']}: minted tickets #{result['first_number']}..#{result['last_number']} "
+        f"in {result['duration_ms'] / 1000:.2f}s"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--lottery-id", type=int, required=True)
+    parser.add_argument("--count", type=int, required=True)
+    parser.add_argument("--batch-size", type=int, default=config.MINT_BATCH_SIZE)
+    args = parser.parse_args()
+    run_async(main(args.lottery_id, args.count, args.batch_size))
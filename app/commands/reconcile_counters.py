@@ -0,0 +1,34 @@
+"""
+Recomputes LotteryCounters from the source tables and reports drift.
+
+    python -m app.commands.reconcile_counters [--lottery-id ID ...] [--dry-run]
+"""
+import argparse
+
+from tortoise import Tortoise, run_async
+
+from app.config import TORTOISE_ORM
+from app.services.counters_service import reconcile_counters
+
+
+async def main(lottery_ids: list[int] | None, dry_run: bool):
+    await Tortoise.init(config=TORTOISE_ORM)
+
+    drift = await reconcile_counters(lottery_ids, apply=not dry_run)
+    for item in drift:
+        print(
+            f"lottery {item['lottery_id']}: {item['field']} "
+            f"stored={item['stored']} expected={item['expected']}"
+        )
+
+    drifted = len({item["lottery_id"] for item in drift})
+    action = "would be fixed" if dry_run else "fixed"
+    print(f"{len(drift)} drifted counters in {drifted} lotteries {action}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--lottery-id", type=int, action="append", dest="lottery_ids")
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+    run_async(main(args.lottery_ids, args.dry_run))
@@ -12,13 +12,50 @@ class Settings(BaseSettings):
     DB_NAME: str
     DB_USER: str
     DB_PASS: str
+
+    DB_POOL_MIN_SIZE: int = 1
+    DB_POOL_MAX_SIZE: int = 10
+    DB_POOL_MAX_QUERIES: int = 50000
+    DB_POOL_MAX_INACTIVE_LIFETIME: float = 300.0
+    DB_STATEMENT_CACHE_SIZE: int = 100
     
     TG_BOT_TOKEN: str
+    INIT_DATA_MAX_AGE_SECONDS: int = 86400
+    INIT_DATA_CACHE_SIZE: int = 10000
     
     JWT_SECRET_KEY: str
     JWT_ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
     REFRESH_TOKEN_EXPIRE_DAYS: int
+
+    IDENTITY_CACHE_SIZE: int = 10000
+    IDENTITY_CACHE_TTL_SECONDS: int = 60
+
+    ACTIVE_LOTTERY_SNAPSHOT_TTL_SECONDS: int = 30
+    TICKET_COUNT_CACHE_TTL_SECONDS: int = 60
+    TICKET_COUNT_CACHE_SIZE: int = 1024
+    TICKET_AVAILABILITY_TTL_SECONDS: int = 300
+    LIVE_STATUS_TTL_SECONDS: int = 30
+
+    WS_SEND_QUEUE_SIZE: int = 16
+    WS_HEARTBEAT_SECONDS: int = 20
+    WS_SEND_TIMEOUT_SECONDS: int = 10
+
+    EVENT_BUS_CHANNEL: str = "treasure_island_events"
+    EVENT_BUS_RECONNECT_SECONDS: int = 5
+
+    RESERVATION_SWEEP_INTERVAL_SECONDS: int = 30
+    RESERVATION_SWEEP_BATCH_SIZE: int = 500
+    RESERVATION_SWEEP_MAX_BATCHES: int = 20
+
+    MINT_BATCH_SIZE: int = 10000
+    MINT_MAX_TICKETS: int = 1000000
+
+    UPLOAD_MAX_SIZE: int = 1024 ** 3
+    UPLOAD_CHUNK_SIZE: int = 1024 ** 2
+    UPLOAD_CONTENT_ADDRESSED: bool = True
+    IMAGE_VARIANT_WORKERS: int = 2
+    IMAGE_VARIANT_MAX_PIXELS: int = 50_000_000
     
     @property
     def DATABASE_URL(self):
@@ -33,7 +70,21 @@ config = Settings()
 
 TORTOISE_ORM = {
     "connections": {
-        "default": config.DATABASE_URL,
+        "default": {
+            "engine": "app.database.pool",
+            "credentials": {
+                "host": config.DB_HOST,
+                "port": config.DB_PORT,
+                "user": config.DB_USER,
+                "password": config.DB_PASS,
+                "database": config.DB_NAME,
+                "minsize": config.DB_POOL_MIN_SIZE,
+                "maxsize": config.DB_POOL_MAX_SIZE,
+                "max_queries": config.DB_POOL_MAX_QUERIES,
+                "max_inactive_connection_lifetime": config.DB_POOL_MAX_INACTIVE_LIFETIME,
+                "statement_cache_size": config.DB_STATEMENT_CACHE_SIZE,
+            },
+        },
     },
     "apps": {
         "app": {
@@ -1,12 +1,11 @@
 from tortoise.contrib.fastapi import register_tortoise
-from app.config import config
+from app.config import TORTOISE_ORM
 
 
 def init_db(app):
     register_tortoise(
         app,
-        db_url=config.DATABASE_URL,
-        modules={"app": ["app.database.models"]}, 
+        config=TORTOISE_ORM,
         generate_schemas=False,
         add_exception_handlers=True,
-    )
\ No newline at end of file
+    )
@@ -6,6 +6,7 @@ from .prizes import Prize
 from .user_prizes import UserPrizes
 from .lottery_prizes import LotteryPrizes
 from .options import Option
+from .lottery_counters import LotteryCounters
 
 __all__ = [
     "User",
@@ -16,4 +17,5 @@ __all__ = [
     "UserPrizes",
     "LotteryPrizes",
     "Option",
+    "LotteryCounters",
 ]
\ No newline at end of file
@@ -19,6 +19,7 @@ class Lottery(Model):
 
     tickets: fields.ReverseRelation["Ticket"]
     lottery_prizes: fields.ReverseRelation["LotteryPrizes"]
+    counters: fields.BackwardOneToOneRelation["LotteryCounters"]
     
     class Meta:
         app = "app"
\ No newline at end of file
@@ -0,0 +1,17 @@
+from tortoise import fields
+from tortoise.models import Model
+
+
+class LotteryCounters(Model):
+    id = fields.BigIntField(pk=True)
+    lottery = fields.OneToOneField("app.Lottery", related_name="counters")
+    ticket_count = fields.IntField(default=0)
+    sold_count = fields.IntField(default=0)
+    revenue = fields.DecimalField(max_digits=14, decimal_places=2, default=0)
+    participants = fields.IntField(default=0)
+    total_nft_count = fields.IntField(default=0)
+    available_nft_count = fields.IntField(default=0)
+    updated_at = fields.DatetimeField(auto_now=True)
+
+    class Meta:
+        app = "app"
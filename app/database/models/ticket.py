@@ -10,7 +10,8 @@ class Ticket(Model):
     name = fields.CharField(max_length=255)
     image = fields.CharField(max_length=255)
     address = fields.CharField(max_length=255)
-    expires_at = fields.DatetimeField(null=True)
+    expires_at = fields.DatetimeField(null=True, index=True)
     
     class Meta:
-        app = "app"
\ No newline at end of file
+        app = "app"
+        indexes = (("lottery_id", "number"),)
\ No newline at end of file
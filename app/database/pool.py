@@ -0,0 +1,120 @@
+import time
+from collections import deque
+from typing import Optional
+
+from tortoise.backends.asyncpg import AsyncpgDBClient
+
+
+class PoolMetrics:
+    """Acquire counters and latencies of the instrumented connection pool."""
+
+    def __init__(self, window: int = 1000):
+        self.acquires = 0
+        self.failures = 0
+        self.waiting = 0
+        self.max_waiting = 0
+        self._latencies: deque[float] = deque(maxlen=window)
+
+    def started(self):
+        self.waiting += 1
+        self.max_waiting = max(self.max_waiting, self.waiting)
+
+    def finished(self, latency: float, failed: bool):
+        self.waiting -= 1
+        if failed:
+            self.failures += 1
+        else:
+            self.acquires += 1
+            self._latencies.append(latency)
+
+    def stats(self) -> dict:
+        latencies = sorted(self._latencies)
+        if latencies:
+            avg = sum(latencies) / len(latencies)
+            p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+            worst = latencies[-1]
+        else:
+            avg = p95 = worst = 0.0
+        return {
+            "acquires": self.acquires,
+            "failures": self.failures,
+            "waiting": self.waiting,
+            "max_waiting": self.max_waiting,
+            "acquire_ms_avg": round(avg * 1000, 3),
+            "acquire_ms_p95": round(p95 * 1000, 3),
+            "acquire_ms_max": round(worst * 1000, 3),
+        }
+
+
+class _AcquireContext:
+    def __init__(self, pool: "InstrumentedPool", timeout: Optional[float]):
+        self._pool = pool
+        self._timeout = timeout
+        self._connection = None
+
+    def __await__(self):
+        return self._pool._acquire(self._timeout).__await__()
+
+    async def __aenter__(self):
+        self._connection = await self._pool._acquire(self._timeout)
+        return self._connection
+
+    async def __aexit__(self, *exc):
+        await self._pool.release(self._connection)
+
+
+class InstrumentedPool:
+    """Proxy around an asyncpg pool that times every ``acquire``."""
+
+    def __init__(self, pool, metrics: PoolMetrics):
+        self._pool = pool
+        self.metrics = metrics
+
+    def __getattr__(self, name):
+        return getattr(self._pool, name)
+
+    def acquire(self, *, timeout: Optional[float] = None) -> _AcquireContext:
+        return _AcquireContext(self, timeout)
+
+    async def _acquire(self, timeout: Optional[float]):
+        self.metrics.started()
+        started = time.perf_counter()
+        failed = True
+        try:
+            connection = await self._pool.acquire(timeout=timeout)
+            failed = False
+            return connection
+        finally:
+            self.metrics.finished(time.perf_counter() - started, failed)
+
+    def stats(self) -> dict:
+        size = self._pool.get_size()
+        idle = self._pool.get_idle_size()
+        return {
+            "size": size,
+            "idle": idle,
+            "in_use": size - idle,
+            "min_size": self._pool.get_min_size(),
+            "max_size": self._pool.get_max_size(),
+            **self.metrics.stats(),
+        }
+
+
+pool_metrics = PoolMetrics()
+
+
+class InstrumentedAsyncpgDBClient(AsyncpgDBClient):
+    async def create_connection(self, with_db: bool) -> None:
+        await super().create_connection(with_db)
+        if self._pool is not None and not isinstance(self._pool, InstrumentedPool):
+            self._pool = InstrumentedPool(self._pool, pool_metrics)
+
+
+def get_pool_stats(client) -> Optional[dict]:
+    pool = getattr(client, "_pool", None)
+    if isinstance(pool, InstrumentedPool):
+        return pool.stats()
+    return None
+
+
+client_class = InstrumentedAsyncpgDBClient
@@ -2,10 +2,14 @@ import os
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from starlette.staticfiles import StaticFiles
 
 from app.database.db import init_db
 from app.routes import router
+from app.services.event_bus import event_bus
+from app.services.event_handlers import register_event_handlers
+from app.services.image_variants import image_variants
+from app.services.reservation_sweeper import reservation_sweeper
+from app.services.static_files import UploadsStaticFiles
 
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -25,9 +29,24 @@ app.add_middleware(
 
 app.mount(
     '/uploads',
-    StaticFiles(directory='app/static'),
+    UploadsStaticFiles(directory='app/static'),
     name='uploads'
 )
 
 init_db(app)
-app.include_router(router)
\ No newline at end of file
+app.include_router(router)
+
+register_event_handlers(event_bus)
+
+
+@app.on_event("startup")
+async def start_background_services():
+    await event_bus.start()
+    reservation_sweeper.start()
+
+
+@app.on_event("shutdown")
+async def stop_background_services():
+    await reservation_sweeper.stop()
+    await event_bus.stop()
+    image_variants.shutdown()
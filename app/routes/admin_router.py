@@ -1,10 +1,16 @@
+import os
 from datetime import datetime, timezone
 from typing import List, Optional
 from fastapi import APIRouter, Depends, Form, HTTPException, Path, Query, UploadFile
 from httpx import request
+from tortoise import connections
+from tortoise.transactions import in_transaction
 
 from app.auth.dependencies import get_current_user
-from app.database.models import Prize, Option
+from app.auth.identity_cache import identity_cache
+from app.config import config
+from app.database.models import Option
+from app.database.pool import get_pool_stats
 from app.database.models.lottery import Lottery
 from app.database.models.lottery_prizes import LotteryPrizes
 from app.database.models.ticket import Ticket
@@ -17,11 +23,19 @@ from app.schemas.admin_schema import (
     IDeleteLotteryResponse,
     IDeleteUserResponse,
     IGetLotteryListResponse,
+    IIdentityCacheStat,
+    IIdentityCacheStatResponse,
+    IReservationSweeperStat,
+    IReservationSweeperStatResponse,
     IGetLotteryResponse,
     IGetShortLotteriesResponse,
     IGetUserListResponse,
     IGetUserResponse,
     ILoginResponse,
+    IPoolStat,
+    IPoolStatResponse,
+    IMintTicketsRequest,
+    IMintTicketsResponse,
     ISetActiveLotteryResponse,
     IStatResponse,
     IUpdateLotteryRequest,
@@ -34,8 +48,13 @@ from app.schemas.lottery_schema import IFullLotteryInfo, IGetLotteriesHistoryRes
 from app.schemas.users_schema import ILotteryShortInfo, IMyNftToken, IPrizeItem, IShortUser, UserOut, IAdminShortUser, \
     IAdminLotteryShortInfo
 from app.services.admin_service import get_admin_statistics
-from app.services.file_upload import FileUpload
-from app.services.lottery_service import get_available_nft_count
+from app.services.counters_service import get_counters, get_counters_many, refresh_counters
+from app.services.file_upload import FileExtNotAllowed, FileMaxSizeLimit, FileUpload
+from app.services.image_variants import image_variants
+from app.services.lottery_service import PrizeNotFound, add_lottery_prizes, replace_lottery_prizes
+from app.services.event_bus import LIVE_STATUS_CHANGED, LOTTERY_CHANGED, USER_CHANGED, event_bus
+from app.services.minting_service import InvalidTicketTemplate, LotteryNotFound, mint_tickets
+from app.services.reservation_sweeper import reservation_sweeper
 from app.services.users_service import login_by_init_data
 
 router = APIRouter(prefix="/admin", tags=["admin"])
@@ -66,6 +85,24 @@ async def get_admin_stat(user=Depends(get_current_user)):
     return await get_admin_statistics()
 
 
+@router.get("/diagnostics/cache", response_model=IIdentityCacheStatResponse)
+async def get_identity_cache_stat(user=Depends(get_current_user)):
+    return IIdentityCacheStatResponse(identity_cache=IIdentityCacheStat(**identity_cache.stats()))
+
+
+@router.get("/diagnostics/sweeper", response_model=IReservationSweeperStatResponse)
+async def get_reservation_sweeper_stat(user=Depends(get_current_user)):
+    return IReservationSweeperStatResponse(sweeper=IReservationSweeperStat(**reservation_sweeper.stats()))
+
+
+@router.get("/diagnostics/pool", response_model=IPoolStatResponse)
+async def get_pool_stat(user=Depends(get_current_user)):
+    stats = get_pool_stats(connections.get("default"))
+    if stats is None:
+        return IPoolStatResponse(message="Connection pool is not instrumented")
+    return IPoolStatResponse(pool=IPoolStat(**stats))
+
+
 @router.get("/lotteries/short", response_model=IGetShortLotteriesResponse)
 async def get_short_lotteries(user=Depends(get_current_user)):
     now = datetime.now(timezone.utc)
@@ -95,6 +132,7 @@ async def set_active_lottery(
     await Lottery.filter(is_active=True).update(is_active=False)
     lottery.is_active = True
     await lottery.save()
+    await event_bus.publish(LOTTERY_CHANGED, lottery_id=lottery.id)
 
     return ISetActiveLotteryResponse(
         active_lottery=IAdminLotteryShortInfo(
@@ -117,10 +155,12 @@ async def change_live_status(req: IChangeStatusLiveRequest, user=Depends(get_cur
         # TODO: Link transfer logic
         option.value = "1"
         await option.save()
+        await event_bus.publish(LIVE_STATUS_CHANGED, status=LiveStatus.ONLINE.value)
         return IChangeStatusLiveResponse(live_status=LiveStatus.ONLINE)
 
     option.value = "0"
     await option.save()
+    await event_bus.publish(LIVE_STATUS_CHANGED, status=LiveStatus.OFFLINE.value)
     return IChangeStatusLiveResponse(live_status=LiveStatus.OFFLINE)
 
 
@@ -178,7 +218,7 @@ async def get_user_info(user_id: int, _: User = Depends(get_current_user)):
         ton_address=user.profile.wallet_address if user.profile else None,
     )
 
-    tickets = await Ticket.filter(owner_id=user.id).select_related("lottery")
+    tickets = await Ticket.filter(owner_id=user.id)
     nfts = [
         IMyNftToken(
             id=t.id,
@@ -190,20 +230,27 @@ async def get_user_info(user_id: int, _: User = Depends(get_current_user)):
         for t in tickets
     ]
 
-    user_prizes = await UserPrizes.filter(user_id=user.id).select_related("prize", "prize__lottery_prizes__lottery")
-    prizes = []
-    for up in user_prizes:
-        prize = up.prize
-        lottery = await LotteryPrizes.filter(prize=prize).select_related("lottery").first()
-        event_date = int(lottery.lottery.event_date.timestamp()) if lottery and lottery.lottery else 0
-
-        prizes.append(IPrizeItem(
-            id=prize.id,
-            title=prize.title,
-            description=prize.description,
-            image=prize.image,
-            event_date=event_date
-        ))
+    user_prizes = await UserPrizes.filter(user_id=user.id).select_related("prize")
+    prize_ids = {up.prize_id for up in user_prizes}
+
+    event_dates = {}
+    if prize_ids:
+        links = await LotteryPrizes.filter(prize_id__in=prize_ids) \
+            .order_by("id") \
+            .values("prize_id", "lottery__event_date")
+        for link in links:
+            event_dates.setdefault(link["prize_id"], int(link["lottery__event_date"].timestamp()))
+
+    prizes = [
+        IPrizeItem(
+            id=up.prize.id,
+            title=up.prize.title,
+            description=up.prize.description,
+            image=up.prize.image,
+            event_date=event_dates.get(up.prize_id, 0)
+        )
+        for up in user_prizes
+    ]
 
     return IGetUserResponse(user=user_out, nfts=nfts, prizes=prizes)
 
@@ -215,6 +262,7 @@ async def delete_user(user_id: int, _: User = Depends(get_current_user)):
         raise HTTPException(status_code=404, detail="User not found")
 
     await user.delete()
+    await event_bus.publish(USER_CHANGED, user_id=user_id)
     return IDeleteUserResponse(success=True)
 
 
@@ -234,6 +282,7 @@ async def update_user(
     user.profile.wallet_address = body.ton_address or user.profile.wallet_address
 
     await user.profile.save()
+    await event_bus.publish(USER_CHANGED, user_id=user_id)
     await user.fetch_related("profile")
 
     return IUpdateUserResponse(
@@ -260,14 +309,15 @@ async def get_lottery_list(
     total = await query.count()
     total_pages = (total + req.limit - 1) // req.limit
 
-    lotteries = await query.offset((req.page - 1) * req.limit).limit(req.limit).prefetch_related("tickets")
+    lotteries = await query.offset((req.page - 1) * req.limit).limit(req.limit)
+    counters = await get_counters_many(l.id for l in lotteries)
 
     lottery_items = [
         IAdminLotteryInfo(
             id=l.id,
             title=l.name,
             event_date=int(l.event_date.timestamp()),
-            total_nft_count=len(l.tickets),
+            total_nft_count=counters[l.id].ticket_count if l.id in counters else 0,
             nft_cost=l.ticket_price
         )
         for l in lotteries
@@ -295,14 +345,15 @@ async def get_lottery_history(
 
     total = await query.count()
     total_pages = (total + limit - 1) // limit
-    lotteries = await query.offset((page - 1) * limit).limit(limit).prefetch_related("tickets")
+    lotteries = await query.offset((page - 1) * limit).limit(limit)
+    counters = await get_counters_many(l.id for l in lotteries)
 
     result: List[IAdminLotteryInfo] = [
         IAdminLotteryInfo(
             id=l.id,
             title=l.name,
             event_date=int(l.event_date.timestamp()),
-            total_nft_count=len(l.tickets),
+            total_nft_count=counters[l.id].ticket_count if l.id in counters else 0,
             nft_cost=l.ticket_price
         )
         for l in lotteries
@@ -325,8 +376,9 @@ async def get_lottery_by_id(
     if not lottery:
         raise HTTPException(status_code=404, detail="Lottery not found")
 
-    available_nft_count = await get_available_nft_count(lottery.id)
-    total_nft_count = await LotteryPrizes.filter(lottery=lottery).count()
+    counters = await get_counters(lottery.id)
+    available_nft_count = counters.available_nft_count
+    total_nft_count = counters.total_nft_count
 
     grand_prizes = []
     prizes = []
@@ -337,6 +389,7 @@ async def get_lottery_by_id(
         if lp.prize.type == 'grand':
             grand_prizes.append(
                 IPrize(
+                    id=lp.prize.id,
                     title=lp.prize.title,
                     image=lp.prize.image,
                     description=lp.prize.description,
@@ -347,6 +400,7 @@ async def get_lottery_by_id(
         else:
             prizes.append(
                 IPrize(
+                    id=lp.prize.id,
                     title=lp.prize.title,
                     image=lp.prize.image,
                     description=lp.prize.description,
@@ -378,69 +432,16 @@ async def get_lottery_by_id(
     return IGetLotteryResponse(lottery=full_info)
 
 
-@router.post("/lotteries/", response_model=IUpdateLotteryResponse)
-async def create_lottery(
-        req: IUpdateLotteryRequest,
-        _: User = Depends(get_current_user)
-):
-    lottery = await Lottery.create(
-        name=req.name,
-        short_description=req.short_description,
-        banner=req.banner,
-        header_banner=req.header_banner,
-        main_banner=req.main_banner,
-        collection_banner=req.collection_banner,
-        event_date=datetime.fromtimestamp(req.event_date, tz=timezone.utc),
-        total_sum=req.total_sum,
-        ticket_price=req.ticket_price,
-        collection_name=req.collection_name,
-    )
-    prizes = []
-    grand_prizes = []
-
-    for pr in req.grand_prizes:
-        prize = await Prize.create(
-            title=pr.title,
-            type='grand',
-            image=pr.image,
-            description=pr.description,
-            quantity=pr.quantity
-        )
-        await LotteryPrizes.create(
-            lottery_id=lottery.id,
-            prize_id=prize.id
-        )
-        grand_prizes.append(
-            IPrize(
-                title=pr.title,
-                image=pr.image,
-                description=pr.description,
-                quantity=pr.quantity,
-                winners=[]
-            )
-        )
-
-    for pr in req.prizes:
-        prize = await Prize.create(
-            title=pr.title,
-            type='common',
-            image=pr.image,
-            description=pr.description,
-            quantity=pr.quantity
-        )
-        await LotteryPrizes.create(
-            lottery_id=lottery.id,
-            prize_id=prize.id
-        )
-        prizes.append(
-            IPrize(
-                title=pr.title,
-                image=pr.image,
-                description=pr.description,
-                quantity=pr.quantity,
-                winners=[]
-            )
-        )
+def build_saved_lottery_response(lottery: Lottery, req: IUpdateLotteryRequest) -> IUpdateLotteryResponse:
+    grand_prizes = [
+        IPrize(id=pr.id, title=pr.title, image=pr.image, description=pr.description, quantity=pr.quantity, winners=[])
+        for pr in req.grand_prizes
+    ]
+    prizes = [
+        IPrize(id=pr.id, title=pr.title, image=pr.image, description=pr.description, quantity=pr.quantity, winners=[])
+        for pr in req.prizes
+    ]
+    total_nft_count = len(grand_prizes) + len(prizes)
 
     return IUpdateLotteryResponse(
         success=True,
@@ -449,23 +450,45 @@ async def create_lottery(
             name=lottery.name,
             short_description=lottery.short_description,
             banner=lottery.banner,
-            header_banner=lottery.header_banner,
-            main_banner=lottery.main_banner,
-            collection_banner=lottery.collection_banner,
+            header_banner=req.header_banner,
+            main_banner=req.main_banner,
             collection_name=lottery.collection_name,
-            event_date=int(lottery.event_date.timestamp()),
+            event_date=str(int(lottery.event_date.timestamp())),
             total_sum=lottery.total_sum,
-            ticket_price=float(lottery.ticket_price),
-            available_nft_count=0,
-            total_nft_count=0,
-            grand_prizes=[],
+            ticket_price=int(lottery.ticket_price),
+            available_nft_count=total_nft_count,
+            total_nft_count=total_nft_count,
+            grand_prizes=grand_prizes,
             prizes=prizes,
-            winners=grand_prizes,
+            winners=[],
             other_lotteries=[]
         )
     )
 
 
+@router.post("/lotteries/", response_model=IUpdateLotteryResponse)
+async def create_lottery(
+        req: IUpdateLotteryRequest,
+        _: User = Depends(get_current_user)
+):
+    async with in_transaction() as connection:
+        lottery = await Lottery.create(
+            name=req.name,
+            short_description=req.short_description,
+            banner=req.banner,
+            collection_banner=req.collection_banner,
+            event_date=datetime.fromtimestamp(req.event_date, tz=timezone.utc),
+            total_sum=req.total_sum,
+            ticket_price=req.ticket_price,
+            collection_name=req.collection_name,
+            using_db=connection
+        )
+        await add_lottery_prizes(lottery.id, req.grand_prizes, req.prizes, connection)
+        await refresh_counters([lottery.id], connection)
+
+    return build_saved_lottery_response(lottery, req)
+
+
 @router.put("/lotteries/{lottery_id}", response_model=IUpdateLotteryResponse)
 async def update_lottery(
         lottery_id: int,
@@ -479,85 +502,23 @@ async def update_lottery(
     lottery.name = req.name
     lottery.short_description = req.short_description
     lottery.banner = req.banner
-    lottery.header_banner = req.header_banner
-    lottery.main_banner = req.main_banner
     lottery.collection_banner = req.collection_banner
     lottery.collection_name = req.collection_name
     lottery.event_date = datetime.fromtimestamp(req.event_date, tz=timezone.utc)
     lottery.total_sum = req.total_sum
     lottery.ticket_price = req.ticket_price
-    lottery.collection_name = req.collection_name
 
-    await lottery.save()
+    try:
+        async with in_transaction() as connection:
+            await lottery.save(using_db=connection)
+            await replace_lottery_prizes(lottery.id, req.grand_prizes, req.prizes, connection)
+            await refresh_counters([lottery.id], connection)
+    except PrizeNotFound:
+        raise HTTPException(status_code=404, detail="Prize not found")
 
-    # TODO: LotteryPrizes relations
-    grand_prizes = []
-    prizes = []
+    await event_bus.publish(LOTTERY_CHANGED, lottery_id=lottery.id)
 
-    await Prize.filter(lottery_prizes__lottery=lottery).delete()
-
-    for pr in req.grand_prizes:
-        prize = await Prize.get_or_none(id=pr.id)
-        if not prize:
-            raise HTTPException(status_code=404, detail="Prize not found")
-        prize.title = pr.title
-        prize.image = pr.image
-        prize.description = pr.description
-        prize.quantity = pr.quantity
-        await prize.save()
-
-        grand_prizes.append(
-            IPrize(
-                title=pr.title,
-                image=pr.image,
-                description=pr.description,
-                quantity=pr.quantity,
-                winners=[]
-            )
-        )
-
-    for pr in req.prizes:
-        prize = await Prize.get_or_none(id=pr.id)
-        if not prize:
-            raise HTTPException(status_code=404, detail="Prize not found")
-        prize.title = pr.title
-        prize.image = pr.image
-        prize.description = pr.description
-        prize.quantity = pr.quantity
-        await prize.save()
-
-        prizes.append(
-            IPrize(
-                title=pr.title,
-                image=pr.image,
-                description=pr.description,
-                quantity=pr.quantity,
-                winners=[]
-            )
-        )
-
-    return IUpdateLotteryResponse(
-        success=True,
-        lottery=IAdminFullLotteryInfo(
-            id=lottery.id,
-            name=lottery.name,
-            short_description=lottery.short_description,
-            banner=lottery.banner,
-            header_banner=lottery.header_banner,
-            main_banner=lottery.main_banner,
-            collection_banner=lottery.collection_banner,
-            collection_name=lottery.collection_name,
-            event_date=int(lottery.event_date.timestamp()),
-            total_sum=lottery.total_sum,
-            ticket_price=float(lottery.ticket_price),
-            available_nft_count=0,
-            total_nft_count=0,
-            grand_prizes=grand_prizes,
-            prizes=prizes,
-            winners=[],
-            other_lotteries=[]
-        )
-    )
+    return build_saved_lottery_response(lottery, req)
 
 
 @router.delete("/lotteries/{lottery_id}", response_model=IDeleteLotteryResponse)
@@ -567,11 +528,46 @@ async def delete_lottery(lottery_id: int, _: User = Depends(get_current_user)):
         raise HTTPException(status_code=404, detail="Lottery not found")
 
     await lottery.delete()
+    await event_bus.publish(LOTTERY_CHANGED, lottery_id=lottery_id)
     return IDeleteLotteryResponse(success=True)
 
 
+@router.post("/lotteries/{lottery_id}/tickets/mint", response_model=IMintTicketsResponse)
+async def mint_lottery_tickets(
+        lottery_id: int,
+        req: IMintTicketsRequest,
+        _: User = Depends(get_current_user)
+):
+    if req.count > config.MINT_MAX_TICKETS:
+        raise HTTPException(status_code=400, detail=f"At most {config.MINT_MAX_TICKETS} tickets can be minted at once")
+
+    try:
+        result = await mint_tickets(lottery_id, req.count, template=req.template)
+    except LotteryNotFound:
+        raise HTTPException(status_code=404, detail="Lottery not found")
+    except InvalidTicketTemplate as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return IMintTicketsResponse(
+        minted=result["minted"],
+        first_number=result["first_number"],
+        last_number=result["last_number"],
+        duration_ms=result["duration_ms"]
+    )
+
+
 @router.post("/upload", response_model=IUploadFileResponse)
 async def upload_lottery_banner(file: UploadFile, _: User = Depends(get_current_user)):
-    upload = FileUpload()
-    file_url = await upload.upload(file)
-    return IUploadFileResponse(file_url=file_url)
+    upload = FileUpload(content_addressed=config.UPLOAD_CONTENT_ADDRESSED)
+    try:
+        file_url = await upload.upload(file)
+    except FileMaxSizeLimit as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except FileExtNotAllowed as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    variants = await image_variants.generate(upload.uploads_dir, os.path.basename(file_url))
+    return IUploadFileResponse(
+        file_url=file_url,
+        variants={name: os.path.join(upload.prefix, filename) for name, filename in variants.items()}
+    )
@@ -1,8 +1,10 @@
 from datetime import datetime, timezone
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Path, WebSocket, WebSocketDisconnect
+from fastapi import APIRouter, Depends, HTTPException, Query, Path, Response, WebSocket, WebSocketDisconnect
+from starlette.websockets import WebSocketState
 from tortoise.expressions import Q
+from tortoise.functions import Count
 from tortoise.timezone import now
 
 from app.auth.dependencies import get_current_user
@@ -18,19 +20,25 @@ from app.schemas.lottery_schema import (
     IMarketNftToken,
     LiveStatus, IPrize, IGetLotteryResponse
 )
-from app.services.lottery_service import get_available_nft_count
+from app.services.counters_service import get_counters
+from app.services.live_status import live_status_cache
+from app.services.lottery_snapshot import active_lottery_snapshot
+from app.services.pagination import InvalidCursor, decode_cursor, encode_cursor
+from app.services.ticket_availability import is_ticket_available, ticket_availability
+from app.services.ticket_count_cache import ticket_count_cache
+from app.services.winners_hub import winners_hub
 
 router = APIRouter(tags=["lotteries"], prefix="/lotteries")
 
 
-@router.get("", response_model=IGetLotteryResponse)
-async def get_lotteries(user=Depends(get_current_user)):
+async def build_active_lottery_response() -> Optional[tuple[IGetLotteryResponse, datetime]]:
     active = await Lottery.get_or_none(is_active=True)
     if not active:
-        raise HTTPException(status_code=404, detail="Active lottery not found")
+        return None
 
-    available_nft = await get_available_nft_count(active.id)
-    total_nft = await LotteryPrizes.filter(lottery=active).count()
+    counters = await get_counters(active.id)
+    available_nft = counters.available_nft_count
+    total_nft = counters.total_nft_count
 
     remaining_seconds = max(0, int((active.event_date - now()).total_seconds()))
 
@@ -55,21 +63,27 @@ async def get_lotteries(user=Depends(get_current_user)):
         total_sum=active.total_sum,
         available_nft_count=available_nft,
         total_nft_count=total_nft,
-        grand_prizes=[IPrize(title=lp.prize.title, image=lp.prize.image, description=lp.prize.description, quantity=lp.prize.quantity, winners=[]) for lp in grand_prizes],
-        prizes=[IPrize(title=lp.prize.title, image=lp.prize.image, description=lp.prize.description, quantity=lp.prize.quantity, winners=[]) for lp in prizes],
+        grand_prizes=[IPrize(id=lp.prize.id, title=lp.prize.title, image=lp.prize.image, description=lp.prize.description, quantity=lp.prize.quantity, winners=[]) for lp in grand_prizes],
+        prizes=[IPrize(id=lp.prize.id, title=lp.prize.title, image=lp.prize.image, description=lp.prize.description, quantity=lp.prize.quantity, winners=[]) for lp in prizes],
         winners=[],
     )
 
-    return IGetLotteryResponse(
-        lottery=active_data
-    )
+    return IGetLotteryResponse(lottery=active_data), active.event_date
+
+
+@router.get("", response_model=IGetLotteryResponse)
+async def get_lotteries(user=Depends(get_current_user)):
+    body = await active_lottery_snapshot.render(build_active_lottery_response)
+    if body is None:
+        raise HTTPException(status_code=404, detail="Active lottery not found")
+
+    return Response(content=body, media_type="application/json")
 
 
 @router.get("/status", response_model=ICheckLiveResponse)
 async def get_live_status(user=Depends(get_current_user)):
-    # TODO Check status logic
     return ICheckLiveResponse(
-        status=LiveStatus.OFFLINE,
+        status=await live_status_cache.get(),
         live_link=None
     )
 
@@ -79,31 +93,53 @@ async def get_lottery_history(
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1),
     q: Optional[str] = None,
+    cursor: Optional[str] = Query(None),
     user=Depends(get_current_user),
 ):
     now = datetime.now(timezone.utc)
-    offset = (page - 1) * limit
-    query = Lottery.filter(event_date__lt=now, is_active=False)
+    query = Lottery.filter(event_date__lt=now, is_active=False).order_by("-event_date", "-id")
 
     if q:
         query = query.filter(name__icontains=q)
 
-    lotteries = await query.offset(offset).limit(limit)
-    result: list[ILotteryHistoryInfo] = []
+    if cursor:
+        try:
+            event_date, lottery_id = decode_cursor(cursor)
+        except InvalidCursor:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        query = query.filter(Q(event_date__lt=event_date) | Q(event_date=event_date, id__lt=lottery_id))
+    else:
+        query = query.offset((page - 1) * limit)
+
+    lotteries = await query.limit(limit + 1)
+    has_more = len(lotteries) > limit
+    lotteries = lotteries[:limit]
+
+    nft_counts = dict(
+        await LotteryPrizes.filter(lottery_id__in=[l.id for l in lotteries])
+        .annotate(count=Count("id"))
+        .group_by("lottery_id")
+        .values_list("lottery_id", "count")
+    )
 
-    for l in lotteries:
-        total_nft_count = await LotteryPrizes.filter(lottery=l).count()
-        result.append(ILotteryHistoryInfo(
+    result: list[ILotteryHistoryInfo] = [
+        ILotteryHistoryInfo(
             id=l.id,
             name=l.name,
             description=l.short_description,
             banner=l.banner,
-            event_date=l.event_date.strftime("%d.%m.%Y %H:%M"),
-            total_nft_count=total_nft_count,
+            event_date=int(l.event_date.timestamp()),
+            total_nft_count=nft_counts.get(l.id, 0),
             ticket_price=l.ticket_price,
-        ))
+        )
+        for l in lotteries
+    ]
+
+    next_cursor = None
+    if has_more:
+        next_cursor = encode_cursor(lotteries[-1].event_date, lotteries[-1].id)
 
-    return IGetLotteriesHistoryResponse(lotteries=result)
+    return IGetLotteriesHistoryResponse(lotteries=result, next_cursor=next_cursor)
 
 
 @router.get("/{lottery_id}", response_model=IGetLotteryResponse)
@@ -115,8 +151,9 @@ async def get_lottery_by_id(
     if not lottery:
         raise HTTPException(status_code=404, detail="Lottery not found")
 
-    available_nft = await get_available_nft_count(lottery.id)
-    total_nft = await LotteryPrizes.filter(lottery=lottery).count()
+    counters = await get_counters(lottery.id)
+    available_nft = counters.available_nft_count
+    total_nft = counters.total_nft_count
 
     remaining_seconds = max(0, int((lottery.event_date - now()).total_seconds()))
 
@@ -141,8 +178,8 @@ async def get_lottery_by_id(
         total_sum=lottery.total_sum,
         available_nft_count=available_nft,
         total_nft_count=total_nft,
-        grand_prizes=[IPrize(title=lp.prize.title, image=lp.prize.image, description=lp.prize.description, quantity=lp.prize.quantity, winners=[]) for lp in grand_prizes],
-        prizes=[IPrize(title=lp.prize.title, image=lp.prize.image, description=lp.prize.description, quantity=lp.prize.quantity, winners=[]) for lp in prizes],
+        grand_prizes=[IPrize(id=lp.prize.id, title=lp.prize.title, image=lp.prize.image, description=lp.prize.description, quantity=lp.prize.quantity, winners=[]) for lp in grand_prizes],
+        prizes=[IPrize(id=lp.prize.id, title=lp.prize.title, image=lp.prize.image, description=lp.prize.description, quantity=lp.prize.quantity, winners=[]) for lp in prizes],
         winners=[]
     )
 
@@ -158,9 +195,11 @@ async def get_lottery_nfts(
     limit: int = Query(20, ge=1),
     min_number: int | None = Query(None),
     max_number: int | None = Query(None),
+    after_number: int | None = Query(None),
+    with_total: bool = Query(True),
+    only_available: bool = Query(False),
     user=Depends(get_current_user)
 ):
-    offset = (page - 1) * limit
     lottery = await Lottery.get_or_none(id=lottery_id)
 
     if not lottery:
@@ -172,10 +211,40 @@ async def get_lottery_nfts(
     if max_number is not None:
         filters &= Q(number__lte=max_number)
 
-    total = await Ticket.filter(filters).count()
-    total_pages = (total + limit - 1) // limit
-    tickets = await Ticket.filter(filters).offset(offset).limit(limit).all()
+    total_pages = None
+    if only_available:
+        bitmap = await ticket_availability.get(lottery_id)
+        if with_total:
+            total = bitmap.count_available(min_number, max_number)
+            total_pages = (total + limit - 1) // limit
+
+        if after_number is not None:
+            start = after_number + 1 if min_number is None else max(after_number + 1, min_number)
+            numbers = bitmap.available_numbers(start, max_number, limit=limit + 1)
+        else:
+            numbers = bitmap.available_numbers(min_number, max_number, skip=(page - 1) * limit, limit=limit + 1)
+
+        next_after_number = numbers[limit - 1] if len(numbers) > limit else None
+        tickets = await Ticket.filter(lottery_id=lottery_id, number__in=numbers[:limit]).order_by("number")
+    else:
+        if with_total:
+            total = ticket_count_cache.get(lottery_id, min_number, max_number)
+            if total is None:
+                total = await Ticket.filter(filters).count()
+                ticket_count_cache.set(lottery_id, min_number, max_number, total)
+            total_pages = (total + limit - 1) // limit
+
+        query = Ticket.filter(filters).order_by("number")
+        if after_number is not None:
+            query = query.filter(number__gt=after_number)
+        else:
+            query = query.offset((page - 1) * limit)
+
+        tickets = await query.limit(limit + 1)
+        next_after_number = tickets[limit - 1].number if len(tickets) > limit else None
+        tickets = tickets[:limit]
 
+    checked_at = datetime.now(timezone.utc)
     nfts = [
         IMarketNftToken(
             id=t.id,
@@ -184,7 +253,7 @@ async def get_lottery_nfts(
             image=t.image,
             address=t.address,
             price=lottery.ticket_price,
-            buy_available=t.owner_id is None,
+            buy_available=is_ticket_available(t, checked_at),
         )
         for t in tickets
     ]
@@ -192,7 +261,8 @@ async def get_lottery_nfts(
     return IGetNftTokensResponse(
         page=page,
         total_pages=total_pages,
-        nfts=nfts
+        nfts=nfts,
+        next_after_number=next_after_number
     )
     
 
@@ -208,25 +278,10 @@ async def lottery_winners_websocket(websocket: WebSocket, lottery_id: int):
         
         user = await get_current_user(websocket, token)
         await websocket.accept()
-
-        from app.database.models import UserPrizes
-        user_prizes = (
-            await UserPrizes
-            .filter(prize__lotteryprizes__lottery_id=lottery_id)
-            .select_related("user")
-            .select_related("prize")
-        )
-
-        winners = []
-        for up in user_prizes:
-            winners.append({
-                "prize_id": up.prize.id,
-                "title": up.prize.title,
-                "user_id": up.user.id,
-            })
-
-        await websocket.send_json({"type": "winner_update", "winners": winners})
+        await winners_hub.serve(websocket, lottery_id)
     except Exception as e:
         import traceback
         traceback.print_exc()
-        await websocket.close()
\ No newline at end of file
+        if websocket.application_state != WebSocketState.DISCONNECTED \
+                and websocket.client_state != WebSocketState.DISCONNECTED:
+            await websocket.close()
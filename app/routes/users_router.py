@@ -1,4 +1,3 @@
-from datetime import datetime, timedelta, timezone
 from fastapi import APIRouter, Body, Depends, Form, HTTPException, Query
 
 from app.auth.dependencies import get_current_user
@@ -7,11 +6,16 @@ from app.database.models.ticket import Ticket
 from app.database.models.user_prizes import UserPrizes
 from app.database.models.users import User
 from app.schemas.users_schema import (
+    IBulkBuyTokensRequest,
+    IBulkBuyTokensResponse,
+    IBuyRandomTokensResponse,
     IBuyTokenResponse,
     IGetMyNftTokensResponse,
     IGetMyPrizesResponse,
     IMyNftToken,
     IPrizeItem,
+    IReservedTicket,
+    ITicketReservationResult,
     IUpdateUserInfoRequest,
     IUpdateUserInfoResponse,
     IUserTokens,
@@ -19,6 +23,8 @@ from app.schemas.users_schema import (
     UserOut,
     ILotteryShortInfo
 )
+from app.services.event_bus import USER_CHANGED, event_bus
+from app.services.reservation_service import reserve_any_tickets, reserve_ticket, reserve_tickets
 from app.services.users_service import login_by_init_data
 
 router = APIRouter(prefix="/users", tags=["users"])
@@ -30,19 +36,35 @@ async def login_by_init_data_handler(init_data: str = Form(...)):
     return InitDataLoginResponse(**tokens)
 
 
+@router.post("/buy", response_model=IBulkBuyTokensResponse)
+async def buy_nfts(data: IBulkBuyTokensRequest = Body(...), user=Depends(get_current_user)):
+    reserved = await reserve_tickets(data.ticket_ids, user.id)
+
+    results = []
+    for ticket_id in dict.fromkeys(data.ticket_ids):
+        ticket = reserved.get(ticket_id)
+        results.append(ITicketReservationResult(
+            ticket_id=ticket_id,
+            reserved=ticket is not None,
+            number=ticket["number"] if ticket else None,
+            expires_at=int(ticket["expires_at"].timestamp()) if ticket else None
+        ))
+
+    payment_link = None
+    if reserved:
+        # TODO Generation link logic
+        ticket_ids = ",".join(str(ticket_id) for ticket_id in sorted(reserved))
+        payment_link = f"https://fake.payment.gateway/nft/{ticket_ids}?user={user.id}"
+
+    return IBulkBuyTokensResponse(success=bool(reserved), payment_link=payment_link, tickets=results)
+
+
 @router.post("/buy/{ticket_id}", response_model=IBuyTokenResponse)
 async def buy_nft(ticket_id: int, user=Depends(get_current_user)):
-    ticket = await Ticket.get_or_none(id=ticket_id)
+    ticket = await reserve_ticket(ticket_id, user.id)
 
     if not ticket:
-        raise HTTPException(status_code=404, detail="Ticket not found")
-
-    if ticket.owner_id is not None:
-        raise HTTPException(status_code=403, detail="Ticket already sold")
-
-    ticket.owner = user
-    ticket.expires_at = datetime.now(timezone.utc) + timedelta(minutes=15)
-    await ticket.save()
+        raise HTTPException(status_code=403, detail="Ticket is not available")
 
     # TODO Generation link logic
     payment_link = f"https://fake.payment.gateway/nft/{ticket_id}?user={user.id}"
@@ -50,6 +72,34 @@ async def buy_nft(ticket_id: int, user=Depends(get_current_user)):
     return IBuyTokenResponse(payment_link=payment_link)
 
 
+@router.post("/buy/random/{lottery_id}", response_model=IBuyRandomTokensResponse)
+async def buy_random_nft(
+    lottery_id: int,
+    count: int = Query(1, ge=1, le=100),
+    user=Depends(get_current_user)
+):
+    tickets = await reserve_any_tickets(lottery_id, user.id, count)
+
+    if not tickets:
+        raise HTTPException(status_code=403, detail="No tickets available")
+
+    # TODO Generation link logic
+    ticket_ids = ",".join(str(ticket["id"]) for ticket in tickets)
+    payment_link = f"https://fake.payment.gateway/nft/{ticket_ids}?user={user.id}"
+
+    return IBuyRandomTokensResponse(
+        payment_link=payment_link,
+        tickets=[
+            IReservedTicket(
+                id=ticket["id"],
+                number=ticket["number"],
+                expires_at=int(ticket["expires_at"].timestamp())
+            )
+            for ticket in tickets
+        ]
+    )
+
+
 @router.put("/updateData", response_model=IUpdateUserInfoResponse)
 async def update_user_data(
     data: IUpdateUserInfoRequest = Body(...),
@@ -73,6 +123,7 @@ async def update_user_data(
         user.profile.inn = data.inn
 
     await user.profile.save()
+    await event_bus.publish(USER_CHANGED, user_id=user.id)
 
     user_out = UserOut(
         id=user.id,
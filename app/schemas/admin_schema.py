@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 from pydantic import BaseModel, ConfigDict, Field
 
 from app.schemas.lottery_schema import LiveStatus, IPrize, IAdminLotteryInfo, \
@@ -60,6 +60,65 @@ class IStatResponse(BaseModel):
     )
 
 
+class IIdentityCacheStat(BaseModel):
+    size: int
+    max_size: int
+    hits: int
+    misses: int
+    hit_ratio: float
+
+    model_config = ConfigDict(
+        alias_generator=to_camel,
+        populate_by_name=True
+    )
+
+
+class IIdentityCacheStatResponse(IStatusResponse):
+    identity_cache: IIdentityCacheStat
+
+
+class IReservationSweeperStat(BaseModel):
+    running: bool
+    sweeps: int
+    total_released: int
+    last_released: int
+    last_duration_ms: float
+    last_swept_at: Optional[int] = None
+
+    model_config = ConfigDict(
+        alias_generator=to_camel,
+        populate_by_name=True
+    )
+
+
+class IReservationSweeperStatResponse(IStatusResponse):
+    sweeper: IReservationSweeperStat
+
+
+class IPoolStat(BaseModel):
+    size: int
+    idle: int
+    in_use: int
+    min_size: int
+    max_size: int
+    acquires: int
+    failures: int
+    waiting: int
+    max_waiting: int
+    acquire_ms_avg: float
+    acquire_ms_p95: float
+    acquire_ms_max: float
+
+    model_config = ConfigDict(
+        alias_generator=to_camel,
+        populate_by_name=True
+    )
+
+
+class IPoolStatResponse(IStatusResponse):
+    pool: Optional[IPoolStat] = None
+
+
 class IGetShortLotteriesResponse(IStatusResponse):
     lotteries: List[ILotteryShortInfo]
     
@@ -198,5 +257,23 @@ class IDeleteLotteryResponse(IStatusResponse):
     pass
 
 
+class IMintTicketsRequest(BaseModel):
+    count: int = Field(..., ge=1)
+    template: Optional[str] = None
+
+    model_config = ConfigDict(
+        alias_generator=to_camel,
+        populate_by_name=True
+    )
+
+
+class IMintTicketsResponse(IStatusResponse):
+    minted: int
+    first_number: int
+    last_number: int
+    duration_ms: float
+
+
 class IUploadFileResponse(IStatusResponse):
     file_url: str
+    variants: Dict[str, str] = {}
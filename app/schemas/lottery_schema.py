@@ -40,6 +40,7 @@ class IAdminLotteryInfo(BaseModel):
 
 
 class IPrize(BaseModel):
+    id: Optional[int] = None
     title: str
     image: str
     description: str
@@ -126,6 +127,7 @@ class ILotteryHistoryInfo(BaseModel):
 class IGetLotteriesHistoryResponse(BaseModel):
     success: bool = True
     lotteries: list[ILotteryHistoryInfo]
+    next_cursor: Optional[str] = None
 
     model_config = ConfigDict(
         from_attributes=True,
@@ -153,8 +155,9 @@ class IMarketNftToken(BaseModel):
 class IGetNftTokensResponse(BaseModel):
     success: bool = True
     page: int
-    total_pages: int
+    total_pages: Optional[int] = None
     nfts: list[IMarketNftToken]
+    next_after_number: Optional[int] = None
 
     model_config = ConfigDict(
         from_attributes=True,
@@ -168,6 +171,9 @@ class IGetNftTokensRequest(BaseModel):
     limit: int = 10
     min_number: int | None = None
     max_number: int | None = None
+    after_number: int | None = None
+    with_total: bool = True
+    only_available: bool = False
 
 
 class LiveStatus(str, Enum):
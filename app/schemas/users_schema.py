@@ -74,6 +74,60 @@ class IBuyTokenResponse(BaseModel):
     )
 
 
+class IReservedTicket(BaseModel):
+    id: int
+    number: int
+    expires_at: int
+
+    model_config = ConfigDict(
+        alias_generator=to_camel,
+        populate_by_name=True
+    )
+
+
+class IBuyRandomTokensResponse(BaseModel):
+    success: bool = True
+    payment_link: str
+    tickets: List[IReservedTicket]
+
+    model_config = ConfigDict(
+        alias_generator=to_camel,
+        populate_by_name=True
+    )
+
+
+class IBulkBuyTokensRequest(BaseModel):
+    ticket_ids: List[int] = Field(..., min_length=1, max_length=100)
+
+    model_config = ConfigDict(
+        alias_generator=to_camel,
+        populate_by_name=True
+    )
+
+
+class ITicketReservationResult(BaseModel):
+    ticket_id: int
+    reserved: bool
+    number: Optional[int] = None
+    expires_at: Optional[int] = None
+
+    model_config = ConfigDict(
+        alias_generator=to_camel,
+        populate_by_name=True
+    )
+
+
+class IBulkBuyTokensResponse(BaseModel):
+    success: bool = True
+    payment_link: Optional[str] = None
+    tickets: List[ITicketReservationResult]
+
+    model_config = ConfigDict(
+        alias_generator=to_camel,
+        populate_by_name=True
+    )
+
+
 class IUpdateUserInfoRequest(BaseModel):
     full_name: Optional[str] = Field(None, min_length=2, max_length=100)
     phone_number: Optional[str] = Field(None, pattern=r"^\+?\d{10,15}$")
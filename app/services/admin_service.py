@@ -1,8 +1,9 @@
 from datetime import datetime, timezone
 
-from app.database.models import User, Lottery, Ticket, Option
+from app.database.models import User, Lottery, Option
 from app.schemas.admin_schema import IStat, IStatResponse, ILotteryShortInfo, LiveStatus
 from app.schemas.users_schema import IAdminLotteryShortInfo
+from app.services.counters_service import get_counters, get_total_revenue
 
 
 async def get_live_status():
@@ -14,22 +15,18 @@ async def get_live_status():
 
 
 async def get_admin_statistics() -> IStatResponse:
-    users_count = await User.all().count()
-    tickets_all = await Ticket.all().count()
-    tickets_sold = await Ticket.exclude(owner=None).count()
-    tickets_earn = 0
-    
-    async for t in Ticket.exclude(owner=None).select_related("lottery"):
-        tickets_earn += t.lottery.ticket_price
-
     now = datetime.now(timezone.utc)
     active_lottery = await Lottery.filter(is_active=True, event_date__gte=now).first()
 
+    users_count = await User.all().count()
+    tickets_earn = await get_total_revenue()
+
     if active_lottery:
-        active_lottery_tickets = await Ticket.filter(lottery=active_lottery).count()
-        active_lottery_sold = await Ticket.filter(lottery=active_lottery).exclude(owner=None).count()
-        active_lottery_users = await Ticket.filter(lottery=active_lottery).exclude(owner=None).distinct().values_list("owner_id", flat=True)
-        active_earn = active_lottery.ticket_price * active_lottery_sold
+        active_counters = await get_counters(active_lottery.id)
+        active_lottery_tickets = active_counters.ticket_count
+        active_lottery_sold = active_counters.sold_count
+        active_lottery_users = active_counters.participants
+        active_earn = active_counters.revenue
 
         active_lottery_info = IAdminLotteryShortInfo(
             id=active_lottery.id,
@@ -41,13 +38,13 @@ async def get_admin_statistics() -> IStatResponse:
         active_lottery_info = None
         active_lottery_tickets = 0
         active_lottery_sold = 0
-        active_lottery_users = []
+        active_lottery_users = 0
         active_earn = 0.0
 
     stat = IStat(
         users_count=users_count,
         tickets_earn=tickets_earn,
-        active_lottery_participants=len(active_lottery_users),
+        active_lottery_participants=active_lottery_users,
         active_lottery_sold_tickets_count=active_lottery_sold,
         active_lottery_tickets_count=active_lottery_tickets,
         active_lottery_tickets_earn=active_earn,
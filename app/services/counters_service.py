@@ -0,0 +1,262 @@
+from decimal import Decimal
+from typing import Iterable, Optional
+
+from tortoise import connections
+from tortoise.backends.base.client import BaseDBAsyncClient
+from tortoise.transactions import in_transaction
+
+from app.database.models import Lottery, LotteryCounters
+
+COUNTER_FIELDS = (
+    "ticket_count",
+    "sold_count",
+    "revenue",
+    "participants",
+    "total_nft_count",
+    "available_nft_count",
+)
+
+# Counters recomputed from the source tables for the lotteries in $1.
+SOURCE_COUNTERS_SQL = """
+SELECT
+    l.id AS lottery_id,
+    t.ticket_count,
+    t.sold_count,
+    t.sold_count * l.ticket_price AS revenue,
+    t.participants,
+    p.total_nft_count,
+    p.total_nft_count - p.used_nft_count AS available_nft_count
+FROM lottery l
+CROSS JOIN LATERAL (
+    SELECT COUNT(*) AS ticket_count,
+           COUNT(owner_id) AS sold_count,
+           COUNT(DISTINCT owner_id) AS participants
+    FROM ticket
+    WHERE lottery_id = l.id
+) t
+CROSS JOIN LATERAL (
+    SELECT COUNT(*) AS total_nft_count,
+           (SELECT COUNT(*) FROM userprizes up
+            WHERE up.prize_id IN (SELECT prize_id FROM lotteryprizes WHERE lottery_id = l.id)) AS used_nft_count
+    FROM lotteryprizes
+    WHERE lottery_id = l.id
+) p
+WHERE l.id = ANY($1::bigint[])
+"""
+
+REFRESH_COUNTERS_SQL = f"""
+INSERT INTO lotterycounters (
+    lottery_id, ticket_count, sold_count, revenue, participants,
+    total_nft_count, available_nft_count, updated_at
+)
+SELECT s.*, CURRENT_TIMESTAMP FROM ({SOURCE_COUNTERS_SQL}) s
+ON CONFLICT (lottery_id) DO UPDATE SET
+    ticket_count = EXCLUDED.ticket_count,
+    sold_count = EXCLUDED.sold_count,
+    revenue = EXCLUDED.revenue,
+    participants = EXCLUDED.participants,
+    total_nft_count = EXCLUDED.total_nft_count,
+    available_nft_count = EXCLUDED.available_nft_count,
+    updated_at = EXCLUDED.updated_at
+RETURNING lottery_id
+"""
+
+# Locks the counters rows of the lotteries in $1 in a stable order. Statements
+# issued afterwards in the same transaction see every ticket change committed
+# by writers that held the lock before, which keeps participant checks exact.
+LOCK_COUNTERS_SQL = """
+SELECT lottery_id FROM lotterycounters
+WHERE lottery_id = ANY($1::bigint[])
+ORDER BY lottery_id
+FOR UPDATE
+"""
+
+TOTAL_REVENUE_SQL = """
+SELECT COALESCE(SUM(revenue), 0) AS revenue FROM lotterycounters
+"""
+
+# $1 lottery, $2 buyer, $3 ids of the tickets just sold to the buyer.
+# The buyer becomes a new participant unless they already own another ticket.
+# Must run after lock_counters() so the check sees concurrent buys committed.
+RECORD_SALES_SQL = """
+UPDATE lotterycounters c SET
+    sold_count = c.sold_count + cardinality($3::bigint[]),
+    revenue = c.revenue + l.ticket_price * cardinality($3::bigint[]),
+    participants = c.participants + CASE WHEN EXISTS (
+        SELECT 1 FROM ticket
+        WHERE lottery_id = $1 AND owner_id = $2 AND id <> ALL($3::bigint[])
+    ) THEN 0 ELSE 1 END,
+    updated_at = CURRENT_TIMESTAMP
+FROM lottery l
+WHERE c.lottery_id = $1 AND l.id = c.lottery_id
+RETURNING c.lottery_id
+"""
+
+# $1 lottery, $2 former owner, $3 number of tickets already released.
+RECORD_RELEASES_SQL = """
+UPDATE lotterycounters c SET
+    sold_count = c.sold_count - $3,
+    revenue = c.revenue - l.ticket_price * $3,
+    participants = c.participants - CASE WHEN EXISTS (
+        SELECT 1 FROM ticket WHERE lottery_id = $1 AND owner_id = $2
+    ) THEN 0 ELSE 1 END,
+    updated_at = CURRENT_TIMESTAMP
+FROM lottery l
+WHERE c.lottery_id = $1 AND l.id = c.lottery_id
+RETURNING c.lottery_id
+"""
+
+# $1 lottery, $2 number of tickets just minted.
+RECORD_MINTED_TICKETS_SQL = """
+UPDATE lotterycounters SET
+    ticket_count = ticket_count + $2,
+    updated_at = CURRENT_TIMESTAMP
+WHERE lottery_id = $1
+RETURNING lottery_id
+"""
+
+# $1 lotteries the assigned prize belongs to.
+RECORD_PRIZE_ASSIGNMENT_SQL = """
+UPDATE lotterycounters SET
+    available_nft_count = available_nft_count - 1,
+    updated_at = CURRENT_TIMESTAMP
+WHERE lottery_id = ANY($1::bigint[])
+RETURNING lottery_id
+"""
+
+
+def _client(connection: Optional[BaseDBAsyncClient]) -> BaseDBAsyncClient:
+    return connection or connections.get("default")
+
+
+async def compute_counters(
+        lottery_ids: Iterable[int],
+        connection: Optional[BaseDBAsyncClient] = None
+) -> dict[int, LotteryCounters]:
+    lottery_ids = list(lottery_ids)
+    if not lottery_ids:
+        return {}
+
+    rows = await _client(connection).execute_query_dict(SOURCE_COUNTERS_SQL, [lottery_ids])
+    return {row["lottery_id"]: LotteryCounters(**row) for row in rows}
+
+
+async def refresh_counters(lottery_ids: Iterable[int], connection: BaseDBAsyncClient):
+    """
+    Recomputes counters rows from the source tables. Must run in a transaction:
+    the rows are locked first so increments committed by concurrent writers
+    are part of the recount instead of being overwritten by it.
+    """
+    lottery_ids = list(lottery_ids)
+    if lottery_ids:
+        await lock_counters(lottery_ids, connection)
+        await connection.execute_query_dict(REFRESH_COUNTERS_SQL, [lottery_ids])
+
+
+async def get_counters_many(lottery_ids: Iterable[int]) -> dict[int, LotteryCounters]:
+    """
+    Reads the stored counters of the given lotteries. Lotteries that have no
+    counters row yet are computed from the source tables in one query.
+    """
+    lottery_ids = set(lottery_ids)
+    if not lottery_ids:
+        return {}
+
+    counters = {c.lottery_id: c for c in await LotteryCounters.filter(lottery_id__in=lottery_ids)}
+    missing = lottery_ids - counters.keys()
+    if missing:
+        counters.update(await compute_counters(missing))
+
+    return counters
+
+
+async def get_total_revenue() -> Decimal:
+    rows = await _client(None).execute_query_dict(TOTAL_REVENUE_SQL)
+    return rows[0]["revenue"]
+
+
+async def lock_counters(lottery_ids: Iterable[int], connection: BaseDBAsyncClient):
+    """Locks counters rows; callers touching several lotteries should lock them all first."""
+    lottery_ids = sorted(set(lottery_ids))
+    if lottery_ids:
+        await connection.execute_query_dict(LOCK_COUNTERS_SQL, [lottery_ids])
+
+
+async def get_counters(lottery_id: int) -> LotteryCounters:
+    counters = await get_counters_many([lottery_id])
+    return counters.get(lottery_id) or LotteryCounters(lottery_id=lottery_id)
+
+
+async def record_ticket_sales(
+        lottery_id: int,
+        owner_id: int,
+        ticket_ids: list[int],
+        connection: BaseDBAsyncClient
+):
+    """Must run in the transaction that assigned ``ticket_ids`` to ``owner_id``."""
+    if not ticket_ids:
+        return
+
+    await lock_counters([lottery_id], connection)
+    rows = await connection.execute_query_dict(RECORD_SALES_SQL, [lottery_id, owner_id, ticket_ids])
+    if not rows:
+        await refresh_counters([lottery_id], connection)
+
+
+async def record_ticket_releases(
+        lottery_id: int,
+        owner_id: int,
+        count: int,
+        connection: BaseDBAsyncClient
+):
+    """Must run in the transaction that released ``count`` tickets of ``owner_id``."""
+    if not count:
+        return
+
+    await lock_counters([lottery_id], connection)
+    rows = await connection.execute_query_dict(RECORD_RELEASES_SQL, [lottery_id, owner_id, count])
+    if not rows:
+        await refresh_counters([lottery_id], connection)
+
+
+async def record_prize_assignment(lottery_ids: list[int], connection: BaseDBAsyncClient):
+    """Must run in the transaction that created the ``UserPrizes`` row."""
+    if not lottery_ids:
+        return
+
+    rows = await connection.execute_query_dict(RECORD_PRIZE_ASSIGNMENT_SQL, [lottery_ids])
+    missing = set(lottery_ids) - {row["lottery_id"] for row in rows}
+    await refresh_counters(missing, connection)
+
+
+async def reconcile_counters(lottery_ids: Optional[Iterable[int]] = None, apply: bool = True) -> list[dict]:
+    """
+    Recomputes counters from ``Ticket``/``LotteryPrizes``/``UserPrizes`` and
+    reports every field that drifted from the stored value.
+    """
+    if lottery_ids is None:
+        lottery_ids = await Lottery.all().values_list("id", flat=True)
+    lottery_ids = list(lottery_ids)
+
+    expected = await compute_counters(lottery_ids)
+    stored = {c.lottery_id: c for c in await LotteryCounters.filter(lottery_id__in=lottery_ids)}
+
+    drift = []
+    for lottery_id, counters in expected.items():
+        current = stored.get(lottery_id)
+        for field in COUNTER_FIELDS:
+            expected_value = getattr(counters, field)
+            stored_value = getattr(current, field) if current else None
+            if stored_value != expected_value:
+                drift.append({
+                    "lottery_id": lottery_id,
+                    "field": field,
+                    "stored": stored_value,
+                    "expected": expected_value,
+                })
+
+    if apply and drift:
+        async with in_transaction() as connection:
+            await refresh_counters({d["lottery_id"] for d in drift}, connection)
+
+    return drift
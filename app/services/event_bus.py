@@ -0,0 +1,136 @@
+import asyncio
+import json
+import logging
+from typing import Callable, Optional
+from uuid import uuid4
+
+import asyncpg
+from tortoise import connections
+
+from app.config import config
+
+logger = logging.getLogger(__name__)
+
+EventHandler = Callable[[dict], None]
+
+TICKETS_SOLD = "tickets_sold"
+TICKETS_RELEASED = "tickets_released"
+PRIZE_ASSIGNED = "prize_assigned"
+LOTTERY_CHANGED = "lottery_changed"
+LIVE_STATUS_CHANGED = "live_status_changed"
+USER_CHANGED = "user_changed"
+RESYNC = "resync"
+
+# Postgres rejects NOTIFY payloads of 8000 bytes or more.
+NOTIFY_PAYLOAD_LIMIT = 7900
+
+
+class EventBus:
+    """
+    Fans compact events out to every worker through Postgres LISTEN/NOTIFY.
+
+    ``publish`` runs the local handlers right away and sends a NOTIFY; each
+    worker listens on a dedicated connection and skips its own messages.
+    After the listener reconnects a ``resync`` event is dispatched locally,
+    since notifications sent in the meantime are lost.
+
+    Events that would not fit into a NOTIFY are sent to other workers without
+    their list fields and flagged ``truncated``; handlers then fall back to
+    invalidating what the lists described. A failed NOTIFY is logged and never
+    fails the write that published it.
+    """
+
+    def __init__(self, dsn: str, channel: str, reconnect_delay: float):
+        self.dsn = dsn
+        self.channel = channel
+        self.reconnect_delay = reconnect_delay
+        self.origin = uuid4().hex
+        self._handlers: dict[str, list[EventHandler]] = {}
+        self._connection: Optional[asyncpg.Connection] = None
+        self._connector: Optional[asyncio.Task] = None
+        self._running = False
+
+    def subscribe(self, event_type: str, handler: EventHandler):
+        self._handlers.setdefault(event_type, []).append(handler)
+
+    async def publish(self, event_type: str, **payload):
+        self._dispatch(event_type, payload)
+
+        message = self._encode(event_type, payload)
+        try:
+            await connections.get("default").execute_query_dict("SELECT pg_notify($1, $2)", [self.channel, message])
+        except Exception:
+            logger.exception("Event bus failed to notify %s", event_type)
+
+    def _encode(self, event_type: str, payload: dict) -> str:
+        message = json.dumps({"type": event_type, "origin": self.origin, **payload}, separators=(",", ":"))
+        if len(message.encode()) < NOTIFY_PAYLOAD_LIMIT:
+            return message
+
+        compact = {key: value for key, value in payload.items() if not isinstance(value, (list, tuple))}
+        return json.dumps(
+            {"type": event_type, "origin": self.origin, **compact, "truncated": True},
+            separators=(",", ":")
+        )
+
+    async def start(self):
+        self._running = True
+        self._connector = asyncio.create_task(self._connect())
+
+    async def stop(self):
+        self._running = False
+        if self._connector is not None:
+            self._connector.cancel()
+        if self._connection is not None and not self._connection.is_closed():
+            await self._connection.close()
+        self._connection = None
+
+    @property
+    def listening(self) -> bool:
+        return self._connection is not None and not self._connection.is_closed()
+
+    async def _connect(self):
+        reconnecting = self._connection is not None
+        while self._running:
+            try:
+                connection = await asyncpg.connect(self.dsn)
+                await connection.add_listener(self.channel, self._on_notification)
+                connection.add_termination_listener(self._on_termination)
+                self._connection = connection
+                break
+            except (OSError, asyncpg.PostgresError) as e:
+                logger.warning("Event bus listener failed to connect: %s", e)
+                await asyncio.sleep(self.reconnect_delay)
+
+        if reconnecting:
+            self._dispatch(RESYNC, {})
+
+    def _on_notification(self, connection, pid, channel, payload: str):
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            logger.warning("Event bus dropped a malformed notification: %r", payload)
+            return
+
+        if message.pop("origin", None) == self.origin:
+            return
+        self._dispatch(message.pop("type", None), message)
+
+    def _on_termination(self, connection):
+        if self._running:
+            logger.warning("Event bus listener connection lost, reconnecting")
+            self._connector = asyncio.create_task(self._connect())
+
+    def _dispatch(self, event_type: Optional[str], payload: dict):
+        for handler in self._handlers.get(event_type, ()):
+            try:
+                handler(payload)
+            except Exception:
+                logger.exception("Event handler %r failed for %s", handler, event_type)
+
+
+event_bus = EventBus(
+    dsn=config.DATABASE_URL,
+    channel=config.EVENT_BUS_CHANNEL,
+    reconnect_delay=config.EVENT_BUS_RECONNECT_SECONDS,
+)
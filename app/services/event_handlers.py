@@ -0,0 +1,71 @@
+from app.auth.identity_cache import identity_cache
+from app.schemas.lottery_schema import LiveStatus
+from app.services.event_bus import (
+    LIVE_STATUS_CHANGED,
+    LOTTERY_CHANGED,
+    PRIZE_ASSIGNED,
+    RESYNC,
+    TICKETS_RELEASED,
+    TICKETS_SOLD,
+    USER_CHANGED,
+    EventBus,
+)
+from app.services.live_status import live_status_cache
+from app.services.lottery_snapshot import active_lottery_snapshot
+from app.services.ticket_availability import ticket_availability
+from app.services.ticket_count_cache import ticket_count_cache
+from app.services.winners_hub import winners_hub
+
+
+def on_tickets_sold(event: dict):
+    active_lottery_snapshot.invalidate()
+    if "numbers" in event:
+        ticket_availability.mark_taken(event["lottery_id"], event["numbers"])
+    else:
+        ticket_availability.invalidate(event["lottery_id"])
+
+
+def on_tickets_released(event: dict):
+    active_lottery_snapshot.invalidate()
+    if "numbers" in event:
+        ticket_availability.mark_available(event["lottery_id"], event["numbers"])
+    else:
+        ticket_availability.invalidate(event["lottery_id"])
+
+
+def on_live_status_changed(event: dict):
+    live_status_cache.set(LiveStatus(event["status"]))
+
+
+def on_prize_assigned(event: dict):
+    active_lottery_snapshot.invalidate()
+    for lottery_id in event.get("lottery_ids", ()):
+        winners_hub.notify(lottery_id)
+
+
+def on_lottery_changed(event: dict):
+    active_lottery_snapshot.invalidate()
+    ticket_availability.invalidate(event["lottery_id"])
+    ticket_count_cache.invalidate_lottery(event["lottery_id"])
+
+
+def on_user_changed(event: dict):
+    identity_cache.invalidate_user(event["user_id"])
+
+
+def on_resync(event: dict):
+    active_lottery_snapshot.invalidate()
+    ticket_availability.clear()
+    ticket_count_cache.clear()
+    identity_cache.clear()
+    live_status_cache.invalidate()
+
+
+def register_event_handlers(bus: EventBus):
+    bus.subscribe(TICKETS_SOLD, on_tickets_sold)
+    bus.subscribe(TICKETS_RELEASED, on_tickets_released)
+    bus.subscribe(PRIZE_ASSIGNED, on_prize_assigned)
+    bus.subscribe(LOTTERY_CHANGED, on_lottery_changed)
+    bus.subscribe(LIVE_STATUS_CHANGED, on_live_status_changed)
+    bus.subscribe(USER_CHANGED, on_user_changed)
+    bus.subscribe(RESYNC, on_resync)
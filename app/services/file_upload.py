@@ -1,4 +1,7 @@
+import asyncio
+import hashlib
 import os
+import tempfile
 from typing import Callable, List, Optional
 from uuid import uuid4
 
@@ -16,25 +19,132 @@ class FileMaxSizeLimit(Exception):
     pass
 
 
+class ContentIndex:
+    """
+    Append-only ``<digest> <filename>`` log of content-addressed uploads.
+
+    Entries are kept in memory and new lines written by other workers are
+    read from the last known offset on a miss, so lookups never scan the
+    uploads directory. ``lock`` serialises lookup-then-add within a worker.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = asyncio.Lock()
+        self._entries: dict[str, str] = {}
+        self._offset = 0
+
+    async def get(self, digest: str) -> Optional[str]:
+        if digest not in self._entries:
+            await self._load()
+        return self._entries.get(digest)
+
+    async def add(self, digest: str, filename: str):
+        async with aiofiles.open(self.path, "a", encoding="utf-8") as f:
+            await f.write(f"{digest} {filename}\n")
+        self._entries[digest] = filename
+
+    async def _load(self):
+        try:
+            async with aiofiles.open(self.path, "rb") as f:
+                await f.seek(self._offset)
+                data = await f.read()
+        except FileNotFoundError:
+            return
+
+        complete = data.rfind(b"\n") + 1
+        for line in data[:complete].decode("utf-8").splitlines():
+            digest, _, filename = line.strip().partition(" ")
+            if filename:
+                self._entries[digest] = filename
+        self._offset += complete
+
+
+_content_indexes: dict[str, ContentIndex] = {}
+
+
+def get_content_index(uploads_dir: str) -> ContentIndex:
+    path = os.path.join(os.path.abspath(uploads_dir), ".content-index")
+    if path not in _content_indexes:
+        _content_indexes[path] = ContentIndex(path)
+    return _content_indexes[path]
+
+
 class FileUpload:
     def __init__(
             self,
             uploads_dir: str = 'app/static/',
             allow_extensions: Optional[List[str]] = None,
-            max_size: int = 1024 ** 3,
+            max_size: int = config.UPLOAD_MAX_SIZE,
             filename_generator: Optional[Callable] = None,
             prefix: str = f'{config.APP_URL}/api/uploads/',
+            chunk_size: int = config.UPLOAD_CHUNK_SIZE,
+            content_addressed: bool = False,
     ):
         self.max_size = max_size
         self.allow_extensions = allow_extensions
         self.uploads_dir = uploads_dir
         self.filename_generator = filename_generator
         self.prefix = prefix
+        self.chunk_size = chunk_size
+        self.content_addressed = content_addressed
 
-    async def save_file(self, filename: str, content: bytes):
-        file = os.path.join(self.uploads_dir, filename)
-        async with aiofiles.open(file, "wb") as f:
-            await f.write(content)
+    def check_extension(self, filename: str):
+        if self.allow_extensions and not any(filename.endswith(ext) for ext in self.allow_extensions):
+            raise FileExtNotAllowed(
+                f"File ext {os.path.splitext(filename)[1]} is not allowed of {self.allow_extensions}"
+            )
+
+    def check_size(self, file_size: int):
+        if file_size > self.max_size:
+            raise FileMaxSizeLimit(f"File size {file_size} exceeds max size {self.max_size}")
+
+    async def _write_temp_file(self, file: UploadFile, hasher=None) -> str:
+        """
+        Streams ``file`` into a temporary file in ``uploads_dir`` in
+        ``chunk_size`` pieces, aborting once ``max_size`` is exceeded.
+        """
+        fd, tmp_path = tempfile.mkstemp(dir=self.uploads_dir, suffix=".part")
+        os.close(fd)
+        try:
+            file_size = 0
+            async with aiofiles.open(tmp_path, "wb") as f:
+                while chunk := await file.read(self.chunk_size):
+                    file_size += len(chunk)
+                    self.check_size(file_size)
+                    if hasher is not None:
+                        hasher.update(chunk)
+                    await f.write(chunk)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        return tmp_path
+
+    async def save_file(self, filename: str, file: UploadFile):
+        tmp_path = await self._write_temp_file(file)
+        os.replace(tmp_path, os.path.join(self.uploads_dir, filename))
+        return os.path.join(self.prefix, filename)
+
+    async def save_content_addressed(self, extension: str, file: UploadFile):
+        """
+        Stores ``file`` under the sha256 of its content. When the same content
+        was uploaded before, the temp file is dropped and the existing URL is
+        returned.
+        """
+        hasher = hashlib.sha256()
+        tmp_path = await self._write_temp_file(file, hasher)
+        digest = hasher.hexdigest()
+
+        index = get_content_index(self.uploads_dir)
+        async with index.lock:
+            existing = await index.get(digest)
+            if existing and os.path.exists(os.path.join(self.uploads_dir, existing)):
+                os.unlink(tmp_path)
+                return os.path.join(self.prefix, existing)
+
+            filename = f'{digest}.{extension}'
+            os.replace(tmp_path, os.path.join(self.uploads_dir, filename))
+            await index.add(digest, filename)
         return os.path.join(self.prefix, filename)
 
     async def upload(self, file: UploadFile):
@@ -43,14 +153,9 @@ class FileUpload:
         else:
             filename = f'{uuid4()}.{file.filename.split(".")[-1]}'
 
-        content = await file.read()
-        file_size = len(content)
-        if file_size > self.max_size:
-            raise FileMaxSizeLimit(f"File size {file_size} exceeds max size {self.max_size}")
-        if self.allow_extensions:
-            for ext in self.allow_extensions:
-                if filename.endswith(ext):
-                    raise FileExtNotAllowed(
-                        f"File ext {ext} is not allowed of {self.allow_extensions}"
-                    )
-        return await self.save_file(filename, content)
+        self.check_extension(filename)
+        if file.size is not None:
+            self.check_size(file.size)
+        if self.content_addressed:
+            return await self.save_content_addressed(filename.split(".")[-1], file)
+        return await self.save_file(filename, file)
@@ -0,0 +1,85 @@
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from app.config import config
+
+IMAGE_EXTENSIONS = {"png", "jpg", "jpeg", "webp", "gif", "bmp"}
+
+# name -> (longest side in pixels or None to keep the original size, WebP quality)
+VARIANTS = {
+    "thumbnail": (320, 75),
+    "medium": (1080, 80),
+    "webp": (None, 85),
+}
+
+
+def variant_filename(filename: str, variant: str) -> str:
+    stem = filename.rsplit(".", 1)[0]
+    return f"{stem}.{variant}.webp"
+
+
+def render_variants(
+        uploads_dir: str,
+        filename: str,
+        max_pixels: int = config.IMAGE_VARIANT_MAX_PIXELS
+) -> dict[str, str]:
+    """
+    Writes the resized WebP variants of an uploaded image next to it and
+    returns their file names. Runs in a worker process.
+
+    Images larger than ``max_pixels`` (checked from the header, before
+    decoding) or that fail to decode get no variants.
+    """
+    source_path = os.path.join(uploads_dir, filename)
+    try:
+        with Image.open(source_path) as source:
+            width, height = source.size
+            if width * height > max_pixels:
+                return {}
+            image = ImageOps.exif_transpose(source)
+            image = image.convert("RGBA" if image.mode in ("RGBA", "LA", "P") else "RGB")
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError, ValueError):
+        return {}
+
+    variants = {}
+    for variant, (max_side, quality) in VARIANTS.items():
+        target = variant_filename(filename, variant)
+        target_path = os.path.join(uploads_dir, target)
+        if not os.path.exists(target_path):
+            resized = image.copy()
+            if max_side is not None:
+                resized.thumbnail((max_side, max_side), Image.LANCZOS)
+            tmp_path = f"{target_path}.part"
+            resized.save(tmp_path, format="WEBP", quality=quality, method=4)
+            os.replace(tmp_path, target_path)
+        variants[variant] = target
+    return variants
+
+
+class ImageVariantPipeline:
+    """Produces upload variants in a process pool so resizing never blocks the event loop."""
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    async def generate(self, uploads_dir: str, filename: str) -> dict[str, str]:
+        if filename.rsplit(".", 1)[-1].lower() not in IMAGE_EXTENSIONS:
+            return {}
+
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, render_variants, uploads_dir, filename)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+image_variants = ImageVariantPipeline(max_workers=config.IMAGE_VARIANT_WORKERS)
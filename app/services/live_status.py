@@ -0,0 +1,33 @@
+import time
+from typing import Optional
+
+from app.config import config
+from app.database.models import Option
+from app.schemas.lottery_schema import LiveStatus
+
+
+class LiveStatusCache:
+    """The ``liveStatus`` option, kept for ``ttl`` seconds or until a change event replaces it."""
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        self._status: Optional[LiveStatus] = None
+        self._expires_at = 0.0
+
+    async def get(self) -> LiveStatus:
+        if self._status is not None and self._expires_at > time.monotonic():
+            return self._status
+
+        option = await Option.get_or_none(key="liveStatus")
+        self.set(LiveStatus.ONLINE if option and option.value == "1" else LiveStatus.OFFLINE)
+        return self._status
+
+    def set(self, status: LiveStatus):
+        self._status = status
+        self._expires_at = time.monotonic() + self.ttl
+
+    def invalidate(self):
+        self._status = None
+
+
+live_status_cache = LiveStatusCache(ttl=config.LIVE_STATUS_TTL_SECONDS)
@@ -1,9 +1,123 @@
+from tortoise.backends.base.client import BaseDBAsyncClient
+from tortoise.transactions import in_transaction
+
 from app.database.models import LotteryPrizes, UserPrizes
+from app.schemas.lottery_schema import IPrize
+from app.services.counters_service import record_prize_assignment
+from app.services.event_bus import PRIZE_ASSIGNED, event_bus
+
+
+class PrizeNotFound(Exception):
+    pass
+
+# Inserts the prizes described by the parallel arrays $2..$6 and links them to
+# lottery $1 in a single statement, whatever the number of prizes.
+INSERT_LOTTERY_PRIZES_SQL = """
+WITH inserted AS (
+    INSERT INTO prize (title, type, image, description, quantity)
+    SELECT * FROM unnest($2::varchar[], $3::varchar[], $4::varchar[], $5::text[], $6::int[])
+    RETURNING id
+)
+INSERT INTO lotteryprizes (lottery_id, prize_id)
+SELECT $1, id FROM inserted
+RETURNING prize_id
+"""
+
+# Updates the lottery's prizes whose ids are in $2 from the parallel arrays
+# $3..$7; ids that are not linked to lottery $1 are left out of RETURNING.
+UPDATE_LOTTERY_PRIZES_SQL = """
+UPDATE prize p SET
+    title = u.title,
+    type = u.type,
+    image = u.image,
+    description = u.description,
+    quantity = u.quantity
+FROM unnest($2::bigint[], $3::varchar[], $4::varchar[], $5::varchar[], $6::text[], $7::int[])
+    AS u(id, title, type, image, description, quantity)
+WHERE p.id = u.id
+  AND p.id IN (SELECT prize_id FROM lotteryprizes WHERE lottery_id = $1)
+RETURNING p.id
+"""
+
+# Deletes the prizes of lottery $1 that are not in $2, together with their
+# links. Prizes that have already been won are kept.
+DELETE_DROPPED_PRIZES_SQL = """
+DELETE FROM prize p
+USING lotteryprizes lp
+WHERE lp.lottery_id = $1
+  AND lp.prize_id = p.id
+  AND p.id <> ALL($2::bigint[])
+  AND NOT EXISTS (SELECT 1 FROM userprizes up WHERE up.prize_id = p.id)
+RETURNING p.id
+"""
+
+
+async def assign_prize(user_id: int, prize_id: int) -> UserPrizes:
+    async with in_transaction() as connection:
+        user_prize = await UserPrizes.create(user_id=user_id, prize_id=prize_id, using_db=connection)
+        lottery_ids = await LotteryPrizes.filter(prize_id=prize_id) \
+            .using_db(connection) \
+            .values_list("lottery_id", flat=True)
+        await record_prize_assignment(list(lottery_ids), connection)
+
+    await event_bus.publish(PRIZE_ASSIGNED, prize_id=prize_id, lottery_ids=list(lottery_ids))
+
+    return user_prize
+
+
+async def add_lottery_prizes(
+        lottery_id: int,
+        grand_prizes: list[IPrize],
+        prizes: list[IPrize],
+        connection: BaseDBAsyncClient
+):
+    """Creates grand and common prizes for a lottery together with their links."""
+    items = [("grand", pr) for pr in grand_prizes] + [("common", pr) for pr in prizes]
+    if not items:
+        return
+
+    await connection.execute_query_dict(INSERT_LOTTERY_PRIZES_SQL, [
+        lottery_id,
+        [pr.title for _, pr in items],
+        [type_ for type_, _ in items],
+        [pr.image for _, pr in items],
+        [pr.description for _, pr in items],
+        [pr.quantity for _, pr in items],
+    ])
+
+
+async def replace_lottery_prizes(
+        lottery_id: int,
+        grand_prizes: list[IPrize],
+        prizes: list[IPrize],
+        connection: BaseDBAsyncClient
+):
+    """
+    Syncs the prize set of a lottery: prizes sent with an id are updated in
+    place, prizes without one are created and the remaining ones are deleted.
+    """
+    items = [("grand", pr) for pr in grand_prizes] + [("common", pr) for pr in prizes]
+    existing = [(type_, pr) for type_, pr in items if pr.id is not None]
+    kept_ids = [pr.id for _, pr in existing]
 
+    if existing:
+        rows = await connection.execute_query_dict(UPDATE_LOTTERY_PRIZES_SQL, [
+            lottery_id,
+            kept_ids,
+            [pr.title for _, pr in existing],
+            [type_ for type_, _ in existing],
+            [pr.image for _, pr in existing],
+            [pr.description for _, pr in existing],
+            [pr.quantity for _, pr in existing],
+        ])
+        missing = set(kept_ids) - {row["id"] for row in rows}
+        if missing:
+            raise PrizeNotFound(min(missing))
 
-async def get_available_nft_count(lottery_id: int) -> int:
-    prize_ids = await LotteryPrizes.filter(lottery_id=lottery_id).values_list("prize_id", flat=True)
-    used_count = await UserPrizes.filter(prize_id__in=prize_ids).count()
-    total_count = len(prize_ids)
-    
-    return total_count - used_count
\ No newline at end of file
+    await connection.execute_query_dict(DELETE_DROPPED_PRIZES_SQL, [lottery_id, kept_ids])
+    await add_lottery_prizes(
+        lottery_id,
+        [pr for pr in grand_prizes if pr.id is None],
+        [pr for pr in prizes if pr.id is None],
+        connection
+    )
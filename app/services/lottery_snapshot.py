@@ -0,0 +1,87 @@
+import asyncio
+import json
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Awaitable, Callable, Optional
+from uuid import uuid4
+
+from pydantic import BaseModel
+
+from app.config import config
+
+SnapshotBuilder = Callable[[], Awaitable[Optional[tuple[BaseModel, datetime]]]]
+
+
+@dataclass
+class _Snapshot:
+    head: Optional[bytes]
+    tail: Optional[bytes]
+    event_timestamp: float
+    expires_at: float
+
+
+class ActiveLotterySnapshot:
+    """
+    Keeps the serialized ``GET /lotteries`` body of the active lottery.
+
+    The JSON is rendered once with a marker in place of ``remainingSeconds``
+    and split around it, so each request only formats the countdown.
+    """
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        self._marker = f"__remaining_{uuid4().hex}__"
+        self._snapshot: Optional[_Snapshot] = None
+        self._version = 0
+        self._lock = asyncio.Lock()
+
+    def invalidate(self):
+        self._version += 1
+        self._snapshot = None
+
+    async def render(self, build: SnapshotBuilder) -> Optional[bytes]:
+        """Returns the response body, or ``None`` when there is no active lottery."""
+        snapshot = self._fresh_snapshot()
+        if snapshot is None:
+            async with self._lock:
+                snapshot = self._fresh_snapshot()
+                if snapshot is None:
+                    version = self._version
+                    snapshot = await self._build(build)
+                    if version == self._version:
+                        self._snapshot = snapshot
+
+        if snapshot.head is None:
+            return None
+
+        remaining_seconds = max(0, int(snapshot.event_timestamp - time.time()))
+        return snapshot.head + str(remaining_seconds).encode() + snapshot.tail
+
+    def _fresh_snapshot(self) -> Optional[_Snapshot]:
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.expires_at > time.monotonic():
+            return snapshot
+        return None
+
+    async def _build(self, build: SnapshotBuilder) -> _Snapshot:
+        expires_at = time.monotonic() + self.ttl
+        result = await build()
+        if result is None:
+            return _Snapshot(head=None, tail=None, event_timestamp=0, expires_at=expires_at)
+
+        response, event_date = result
+        content = response.model_dump(mode="json", by_alias=True)
+        content["lottery"]["remainingSeconds"] = self._marker
+        body = json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+        head, _, tail = body.partition(json.dumps(self._marker).encode())
+
+        return _Snapshot(
+            head=head,
+            tail=tail,
+            event_timestamp=event_date.timestamp(),
+            expires_at=expires_at,
+        )
+
+
+active_lottery_snapshot = ActiveLotterySnapshot(ttl=config.ACTIVE_LOTTERY_SNAPSHOT_TTL_SECONDS)
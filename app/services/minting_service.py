@@ -0,0 +1,150 @@
+import json
+import logging
+import time
+from typing import Callable, Iterator, Optional
+
+from tortoise import connections
+
+from app.config import config
+from app.services.counters_service import RECORD_MINTED_TICKETS_SQL, REFRESH_COUNTERS_SQL
+from app.services.event_bus import LOTTERY_CHANGED, event_bus
+
+logger = logging.getLogger(__name__)
+
+TICKET_COLUMNS = ("lottery_id", "number", "name", "image", "address")
+NUMBER_PLACEHOLDER = "{number}"
+TICKET_FIELD_MAX_LENGTH = 255
+
+# Locks the lottery so concurrent mints append after each other, and returns
+# what is needed to render tickets after the current highest number.
+LOCK_LOTTERY_SQL = """
+SELECT l.id, l.collection_name, l.collection_banner, l.ticket_template,
+       (SELECT COALESCE(MAX(number), 0) FROM ticket WHERE lottery_id = l.id) AS last_number
+FROM lottery l
+WHERE l.id = $1
+FOR UPDATE
+"""
+
+SAVE_TEMPLATE_SQL = "UPDATE lottery SET ticket_template = $2 WHERE id = $1"
+
+
+class LotteryNotFound(Exception):
+    pass
+
+
+class InvalidTicketTemplate(Exception):
+    pass
+
+
+def parse_ticket_template(template: Optional[str], collection_name: str, collection_banner: str) -> dict[str, str]:
+    """
+    Parses ``Lottery.ticket_template``: a JSON object with ``name``, ``image`` and
+    ``address`` strings in which ``{number}`` is replaced by the ticket number.
+    """
+    parsed = {}
+    if template:
+        try:
+            parsed = json.loads(template)
+        except ValueError as e:
+            raise InvalidTicketTemplate(f"Ticket template is not valid JSON: {e}") from e
+        if not isinstance(parsed, dict):
+            raise InvalidTicketTemplate("Ticket template must be a JSON object")
+
+    fields = {
+        "name": parsed.get("name", f"{collection_name} #{NUMBER_PLACEHOLDER}"),
+        "image": parsed.get("image", collection_banner),
+        "address": parsed.get("address", ""),
+    }
+    for key, value in fields.items():
+        if not isinstance(value, str):
+            raise InvalidTicketTemplate(f"Ticket template field '{key}' must be a string")
+    return fields
+
+
+def check_ticket_lengths(template: dict[str, str], last_number: int):
+    """Rejects templates whose fields would overflow the ticket columns; the last number renders longest."""
+    for key, value in template.items():
+        length = len(value.replace(NUMBER_PLACEHOLDER, str(last_number)))
+        if length > TICKET_FIELD_MAX_LENGTH:
+            raise InvalidTicketTemplate(
+                f"Ticket template field '{key}' renders to {length} characters, "
+                f"at most {TICKET_FIELD_MAX_LENGTH} are allowed"
+            )
+
+
+def render_tickets(lottery_id: int, template: dict[str, str], start: int, stop: int) -> Iterator[tuple]:
+    for number in range(start, stop):
+        value = str(number)
+        yield (
+            lottery_id,
+            number,
+            template["name"].replace(NUMBER_PLACEHOLDER, value),
+            template["image"].replace(NUMBER_PLACEHOLDER, value),
+            template["address"].replace(NUMBER_PLACEHOLDER, value),
+        )
+
+
+async def mint_tickets(
+        lottery_id: int,
+        count: int,
+        batch_size: int = config.MINT_BATCH_SIZE,
+        progress: Optional[Callable[[int, int], None]] = None,
+        template: Optional[str] = None
+) -> dict:
+    """
+    Appends ``count`` tickets to a lottery, numbered after its current last ticket.
+
+    Rows are streamed with COPY in chunks of ``batch_size`` inside one
+    transaction; ``progress(minted, count)`` is called after every chunk.
+    A given ``template`` replaces ``Lottery.ticket_template`` in the same
+    transaction, so it is only kept if the mint succeeds.
+    """
+    started = time.perf_counter()
+    client = connections.get("default")
+
+    async with client.acquire_connection() as connection:
+        async with connection.transaction():
+            lottery = await connection.fetchrow(LOCK_LOTTERY_SQL, lottery_id)
+            if lottery is None:
+                raise LotteryNotFound(lottery_id)
+
+            fields = parse_ticket_template(
+                lottery["ticket_template"] if template is None else template,
+                lottery["collection_name"],
+                lottery["collection_banner"],
+            )
+            first_number = lottery["last_number"] + 1
+            stop = first_number + count
+            check_ticket_lengths(fields, stop - 1)
+
+            if template is not None:
+                await connection.execute(SAVE_TEMPLATE_SQL, lottery_id, template)
+
+            minted = 0
+            for chunk_start in range(first_number, stop, batch_size):
+                chunk_stop = min(chunk_start + batch_size, stop)
+                await connection.copy_records_to_table(
+                    "ticket",
+                    records=render_tickets(lottery_id, fields, chunk_start, chunk_stop),
+                    columns=TICKET_COLUMNS,
+                )
+                minted += chunk_stop - chunk_start
+                if progress is not None:
+                    progress(minted, count)
+
+            # The UPDATE holds the counters row lock until commit, so sales
+            # recorded meanwhile are applied on top of the new ticket count.
+            if await connection.fetchrow(RECORD_MINTED_TICKETS_SQL, lottery_id, count) is None:
+                await connection.fetch(REFRESH_COUNTERS_SQL, [lottery_id])
+
+    await event_bus.publish(LOTTERY_CHANGED, lottery_id=lottery_id)
+
+    duration = time.perf_counter() - started
+    logger.info("Minted %s tickets for lottery %s in %.3fs", count, lottery_id, duration)
+    return {
+        "lottery_id": lottery_id,
+        "minted": count,
+        "first_number": first_number,
+        "last_number": stop - 1,
+        "duration_ms": round(duration * 1000, 3),
+    }
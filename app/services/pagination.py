@@ -0,0 +1,21 @@
+import base64
+import json
+from datetime import datetime
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+def encode_cursor(event_date: datetime, item_id: int) -> str:
+    raw = json.dumps([event_date.isoformat(), item_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        event_date, item_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(event_date), int(item_id)
+    except (ValueError, TypeError):
+        raise InvalidCursor(f"Malformed cursor {cursor!r}")
@@ -0,0 +1,141 @@
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from tortoise.transactions import in_transaction
+
+from app.services.counters_service import lock_counters, record_ticket_releases, record_ticket_sales
+from app.services.event_bus import TICKETS_SOLD, event_bus
+
+RESERVATION_TTL = timedelta(minutes=15)
+
+# Reserves ticket $1 for user $2 until $3 if it is free or its reservation expired.
+# Returns nothing when the ticket is taken, so concurrent buyers cannot both win.
+RESERVE_TICKET_SQL = """
+UPDATE ticket t SET owner_id = $2, expires_at = $3
+FROM (SELECT id, owner_id FROM ticket WHERE id = $1 FOR UPDATE) previous
+WHERE t.id = previous.id
+  AND (t.owner_id IS NULL OR t.expires_at < CURRENT_TIMESTAMP)
+RETURNING t.id, t.lottery_id, t.number, t.expires_at, previous.owner_id AS previous_owner_id
+"""
+
+# Reserves up to $3 free tickets of lottery $1 for user $2 until $4. Rows locked
+# by other buyers are skipped instead of waited on, so concurrent buyers each
+# get a different set of tickets. The two branches of the OR are served by the
+# partial index on unowned tickets and the expires_at index, so sold tickets
+# are never scanned however far the lottery has sold out.
+RESERVE_ANY_TICKETS_SQL = """
+WITH picked AS (
+    SELECT id, owner_id FROM ticket
+    WHERE lottery_id = $1
+      AND (owner_id IS NULL OR expires_at < CURRENT_TIMESTAMP)
+    ORDER BY number
+    LIMIT $3
+    FOR UPDATE SKIP LOCKED
+)
+UPDATE ticket t SET owner_id = $2, expires_at = $4
+FROM picked
+WHERE t.id = picked.id
+RETURNING t.id, t.lottery_id, t.number, t.expires_at, picked.owner_id AS previous_owner_id
+"""
+
+# Reserves every ticket of $1 that is free or whose reservation expired for
+# user $2 until $3. Rows are locked in id order so overlapping bulk requests
+# cannot deadlock.
+RESERVE_TICKETS_SQL = """
+UPDATE ticket t SET owner_id = $2, expires_at = $3
+FROM (SELECT id, owner_id FROM ticket WHERE id = ANY($1::bigint[]) ORDER BY id FOR UPDATE) previous
+WHERE t.id = previous.id
+  AND (t.owner_id IS NULL OR t.expires_at < CURRENT_TIMESTAMP)
+RETURNING t.id, t.lottery_id, t.number, t.expires_at, previous.owner_id AS previous_owner_id
+"""
+
+
+async def _record_reservations(tickets: list[dict], user_id: int, connection):
+    sold: dict[int, list[int]] = defaultdict(list)
+    released: dict[tuple[int, int], int] = defaultdict(int)
+
+    for ticket in tickets:
+        previous_owner_id = ticket["previous_owner_id"]
+        if previous_owner_id == user_id:
+            continue
+        if previous_owner_id is not None:
+            released[(ticket["lottery_id"], previous_owner_id)] += 1
+        sold[ticket["lottery_id"]].append(ticket["id"])
+
+    await lock_counters({ticket["lottery_id"] for ticket in tickets}, connection)
+    for (lottery_id, owner_id), count in released.items():
+        await record_ticket_releases(lottery_id, owner_id, count, connection)
+    for lottery_id, ticket_ids in sold.items():
+        await record_ticket_sales(lottery_id, user_id, ticket_ids, connection)
+
+
+async def _publish_reservations(tickets: list[dict]):
+    numbers: dict[int, list[int]] = defaultdict(list)
+    for ticket in tickets:
+        numbers[ticket["lottery_id"]].append(ticket["number"])
+
+    for lottery_id, lottery_numbers in numbers.items():
+        await event_bus.publish(TICKETS_SOLD, lottery_id=lottery_id, numbers=lottery_numbers)
+
+
+async def reserve_ticket(ticket_id: int, user_id: int) -> Optional[dict]:
+    """Reserves a single ticket, returning the reserved row or ``None`` if it is unavailable."""
+    expires_at = datetime.now(timezone.utc) + RESERVATION_TTL
+
+    async with in_transaction() as connection:
+        rows = await connection.execute_query_dict(RESERVE_TICKET_SQL, [ticket_id, user_id, expires_at])
+        if not rows:
+            return None
+
+        await _record_reservations(rows, user_id, connection)
+
+    await _publish_reservations(rows)
+    return rows[0]
+
+
+async def reserve_tickets(ticket_ids: list[int], user_id: int) -> dict[int, dict]:
+    """Reserves all available tickets among ``ticket_ids`` and returns the reserved rows by id."""
+    expires_at = datetime.now(timezone.utc) + RESERVATION_TTL
+
+    async with in_transaction() as connection:
+        rows = await connection.execute_query_dict(
+            RESERVE_TICKETS_SQL, [list(set(ticket_ids)), user_id, expires_at]
+        )
+        if not rows:
+            return {}
+
+        await _record_reservations(rows, user_id, connection)
+
+    await _publish_reservations(rows)
+    return {row["id"]: row for row in rows}
+
+
+async def reserve_any_tickets(lottery_id: int, user_id: int, count: int) -> list[dict]:
+    """
+    Reserves up to ``count`` free tickets of a lottery, lowest numbers first.
+
+    A ticket taken by a concurrent buyer after the statement's snapshot is
+    dropped by the row lock re-check rather than replaced, so the allocation is
+    repeated for the shortfall until enough tickets are reserved or none is left.
+    """
+    expires_at = datetime.now(timezone.utc) + RESERVATION_TTL
+
+    async with in_transaction() as connection:
+        rows = []
+        while len(rows) < count:
+            batch = await connection.execute_query_dict(
+                RESERVE_ANY_TICKETS_SQL, [lottery_id, user_id, count - len(rows), expires_at]
+            )
+            if not batch:
+                break
+            rows.extend(batch)
+
+        if not rows:
+            return []
+
+        await _record_reservations(rows, user_id, connection)
+
+    rows.sort(key=lambda row: row["number"])
+    await _publish_reservations(rows)
+    return rows
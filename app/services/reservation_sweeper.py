@@ -0,0 +1,122 @@
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from typing import Optional
+
+from tortoise.transactions import in_transaction
+
+from app.config import config
+from app.services.counters_service import lock_counters, record_ticket_releases
+from app.services.event_bus import TICKETS_RELEASED, event_bus
+
+logger = logging.getLogger(__name__)
+
+# Frees at most $1 expired reservations, oldest first. SKIP LOCKED keeps the
+# sweep from waiting on tickets that buyers are reserving at the same time.
+RELEASE_EXPIRED_SQL = """
+WITH expired AS (
+    SELECT id, owner_id FROM ticket
+    WHERE expires_at < CURRENT_TIMESTAMP AND owner_id IS NOT NULL
+    ORDER BY expires_at
+    LIMIT $1
+    FOR UPDATE SKIP LOCKED
+)
+UPDATE ticket t SET owner_id = NULL, expires_at = NULL
+FROM expired
+WHERE t.id = expired.id
+RETURNING t.lottery_id, t.number, expired.owner_id
+"""
+
+
+class ReservationSweeper:
+    """Periodically returns tickets with expired, unpaid reservations to sale."""
+
+    def __init__(self, interval: float, batch_size: int, max_batches: int):
+        self.interval = interval
+        self.batch_size = batch_size
+        self.max_batches = max_batches
+        self.sweeps = 0
+        self.total_released = 0
+        self.last_released = 0
+        self.last_duration = 0.0
+        self.last_swept_at: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def sweep(self) -> int:
+        """Releases expired reservations batch by batch and returns how many were freed."""
+        started = time.perf_counter()
+        released = 0
+        for _ in range(self.max_batches):
+            batch = await self._release_batch()
+            released += batch
+            if batch < self.batch_size:
+                break
+
+        self.sweeps += 1
+        self.total_released += released
+        self.last_released = released
+        self.last_duration = time.perf_counter() - started
+        self.last_swept_at = time.time()
+        return released
+
+    def stats(self) -> dict:
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "sweeps": self.sweeps,
+            "total_released": self.total_released,
+            "last_released": self.last_released,
+            "last_duration_ms": round(self.last_duration * 1000, 3),
+            "last_swept_at": int(self.last_swept_at) if self.last_swept_at else None,
+        }
+
+    async def _release_batch(self) -> int:
+        released_numbers: dict[int, list[int]] = defaultdict(list)
+        released_by_owner: dict[tuple[int, int], int] = defaultdict(int)
+
+        async with in_transaction() as connection:
+            rows = await connection.execute_query_dict(RELEASE_EXPIRED_SQL, [self.batch_size])
+            for row in rows:
+                released_numbers[row["lottery_id"]].append(row["number"])
+                released_by_owner[(row["lottery_id"], row["owner_id"])] += 1
+
+            await lock_counters(released_numbers.keys(), connection)
+            for (lottery_id, owner_id), count in released_by_owner.items():
+                await record_ticket_releases(lottery_id, owner_id, count, connection)
+
+        for lottery_id, numbers in released_numbers.items():
+            await event_bus.publish(TICKETS_RELEASED, lottery_id=lottery_id, numbers=numbers)
+
+        return len(rows)
+
+    async def _run(self):
+        while True:
+            try:
+                released = await self.sweep()
+                if released:
+                    logger.info("Released %s expired reservations in %.3fs", released, self.last_duration)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Reservation sweep failed")
+            await asyncio.sleep(self.interval)
+
+
+reservation_sweeper = ReservationSweeper(
+    interval=config.RESERVATION_SWEEP_INTERVAL_SECONDS,
+    batch_size=config.RESERVATION_SWEEP_BATCH_SIZE,
+    max_batches=config.RESERVATION_SWEEP_MAX_BATCHES,
+)
@@ -0,0 +1,117 @@
+import hashlib
+import mimetypes
+import os
+import re
+from typing import Optional
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+# sha256 digests written by the content-addressed upload mode and uuid4 names,
+# optionally followed by a variant suffix. Their content never changes.
+IMMUTABLE_NAME_RE = re.compile(
+    r"^(?:[0-9a-f]{64}|[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})(?:\.|$)"
+)
+
+# Precompressed siblings in order of preference.
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "public, no-cache"
+
+
+def is_private(path: str) -> bool:
+    """Dotfiles (e.g. the upload content index) and in-progress ``.part`` files are never served."""
+    return any(part.startswith(".") or part.endswith(".part") for part in re.split(r"[/\\]", path) if part)
+
+
+def is_immutable(filename: str) -> bool:
+    return IMMUTABLE_NAME_RE.match(filename) is not None
+
+
+def accepted_encodings(accept_encoding: str) -> set[str]:
+    accepted = set()
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        quality = params.strip()
+        if quality.startswith("q="):
+            try:
+                if float(quality[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(coding.strip().lower())
+    return accepted
+
+
+class UploadsStaticFiles(StaticFiles):
+    """
+    StaticFiles for the uploads directory.
+
+    Content-hashed and uuid names are served as immutable, ``.br``/``.gz``
+    siblings are served when the client accepts them, and every response
+    carries an ETag so revalidation ends in a 304. Private files
+    (see ``is_private``) answer 404.
+    """
+
+    def lookup_path(self, path: str) -> tuple[str, Optional[os.stat_result]]:
+        if is_private(path):
+            return "", None
+        return super().lookup_path(path)
+
+    def file_response(
+            self,
+            full_path,
+            stat_result: os.stat_result,
+            scope: Scope,
+            status_code: int = 200,
+    ) -> Response:
+        request_headers = Headers(scope=scope)
+        full_path = str(full_path)
+        filename = os.path.basename(full_path)
+
+        encoding, served_path, served_stat = self.negotiate_encoding(full_path, stat_result, request_headers)
+        media_type = mimetypes.guess_type(filename)[0] or "text/plain"
+        response = FileResponse(served_path, status_code=status_code, stat_result=served_stat, media_type=media_type)
+
+        if encoding:
+            response.headers["content-encoding"] = encoding
+        response.headers["vary"] = "Accept-Encoding"
+        response.headers["etag"] = self.strong_etag(full_path, filename, stat_result, encoding)
+        response.headers["cache-control"] = (
+            IMMUTABLE_CACHE_CONTROL if is_immutable(filename) else REVALIDATE_CACHE_CONTROL
+        )
+
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+    @staticmethod
+    def negotiate_encoding(
+            full_path: str,
+            stat_result: os.stat_result,
+            request_headers: Headers,
+    ) -> tuple[Optional[str], str, os.stat_result]:
+        accepted = accepted_encodings(request_headers.get("accept-encoding", ""))
+        for encoding, suffix in ENCODINGS:
+            if encoding not in accepted:
+                continue
+            try:
+                sibling_stat = os.stat(full_path + suffix)
+            except OSError:
+                continue
+            return encoding, full_path + suffix, sibling_stat
+        return None, full_path, stat_result
+
+    @staticmethod
+    def strong_etag(full_path: str, filename: str, stat_result: os.stat_result, encoding: Optional[str]) -> str:
+        # Immutable names identify their content; other files are validated by
+        # inode, mtime and size so no request ever reads a file to hash it.
+        if is_immutable(filename):
+            source = filename
+        else:
+            source = f"{full_path}:{stat_result.st_ino}:{stat_result.st_mtime_ns}:{stat_result.st_size}"
+        tag = hashlib.sha256(source.encode()).hexdigest()[:32]
+        return f'"{tag}-{encoding}"' if encoding else f'"{tag}"'
@@ -0,0 +1,216 @@
+import asyncio
+import re
+import time
+from datetime import datetime, timezone
+from typing import Iterable, Optional
+
+from tortoise.expressions import Q
+
+from app.config import config
+from app.database.models import Ticket
+
+_NON_ZERO_BYTE = re.compile(rb"[^\x00]")
+
+
+def is_ticket_available(ticket: Ticket, now: datetime) -> bool:
+    """Same rule the bitmap is loaded with: unowned, or held by an expired reservation."""
+    return ticket.owner_id is None or (ticket.expires_at is not None and ticket.expires_at < now)
+
+
+class TicketBitmap:
+    """
+    Availability of a lottery's tickets, one bit per ticket number.
+
+    A set bit means the ticket with that number exists and is neither sold
+    nor held by an unexpired reservation.
+    """
+
+    def __init__(self, available_numbers: Iterable[int] = ()):
+        self._bits = bytearray()
+        self._count = 0
+        for number in available_numbers:
+            self.mark_available(number)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def is_available(self, number: int) -> bool:
+        byte = number >> 3
+        return 0 <= byte < len(self._bits) and bool(self._bits[byte] & (1 << (number & 7)))
+
+    def mark_available(self, number: int):
+        if number < 0 or self.is_available(number):
+            return
+
+        byte = number >> 3
+        if byte >= len(self._bits):
+            self._bits.extend(bytes(byte - len(self._bits) + 1))
+        self._bits[byte] |= 1 << (number & 7)
+        self._count += 1
+
+    def mark_taken(self, number: int):
+        if not self.is_available(number):
+            return
+
+        self._bits[number >> 3] &= ~(1 << (number & 7)) & 0xFF
+        self._count -= 1
+
+    def count_available(self, start: Optional[int] = None, stop: Optional[int] = None) -> int:
+        """Counts available numbers in ``[start, stop]``."""
+        if start is None and stop is None:
+            return self._count
+
+        start, stop = self._bounds(start, stop)
+        if start > stop:
+            return 0
+
+        first_byte, last_byte = start >> 3, stop >> 3
+        chunk = int.from_bytes(self._bits[first_byte:last_byte + 1], "little")
+        chunk >>= start & 7
+        chunk &= (1 << (stop - start + 1)) - 1
+        return chunk.bit_count()
+
+    def available_numbers(
+            self,
+            start: Optional[int] = None,
+            stop: Optional[int] = None,
+            skip: int = 0,
+            limit: Optional[int] = None
+    ) -> list[int]:
+        """Lists available numbers in ``[start, stop]`` in ascending order."""
+        start, stop = self._bounds(start, stop)
+        result = []
+        if start > stop or limit == 0:
+            return result
+
+        position = start >> 3
+        last_byte = stop >> 3
+        while position <= last_byte:
+            match = _NON_ZERO_BYTE.search(self._bits, position, last_byte + 1)
+            if match is None:
+                break
+
+            byte_index = match.start()
+            byte = self._bits[byte_index]
+            for bit in range(8):
+                number = (byte_index << 3) + bit
+                if not byte & (1 << bit) or number < start:
+                    continue
+                if number > stop:
+                    return result
+                if skip:
+                    skip -= 1
+                    continue
+                result.append(number)
+                if limit is not None and len(result) >= limit:
+                    return result
+
+            position = byte_index + 1
+
+        return result
+
+    def next_available(self, after: int, count: int, stop: Optional[int] = None) -> list[int]:
+        return self.available_numbers(after + 1, stop, limit=count)
+
+    def _bounds(self, start: Optional[int], stop: Optional[int]) -> tuple[int, int]:
+        upper = len(self._bits) * 8 - 1
+        start = 0 if start is None else max(start, 0)
+        stop = upper if stop is None else min(stop, upper)
+        return start, stop
+
+
+class TicketAvailability:
+    """
+    Per-lottery ``TicketBitmap`` registry.
+
+    Bitmaps are loaded from ``Ticket`` on first use and reloaded after
+    ``ttl`` seconds; writers keep them current in between. Changes made
+    while a load is in flight are replayed onto the loaded bitmap, since
+    its query may have run before them.
+    """
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        self._bitmaps: dict[int, tuple[float, TicketBitmap]] = {}
+        self._locks: dict[int, asyncio.Lock] = {}
+        # lottery id -> (taken, numbers) changes seen during its load; None once invalidated
+        self._pending: dict[int, Optional[list[tuple[bool, list[int]]]]] = {}
+
+    async def get(self, lottery_id: int) -> TicketBitmap:
+        bitmap = self._fresh(lottery_id)
+        if bitmap is not None:
+            return bitmap
+
+        lock = self._locks.setdefault(lottery_id, asyncio.Lock())
+        async with lock:
+            bitmap = self._fresh(lottery_id)
+            if bitmap is None:
+                bitmap = await self._load_tracked(lottery_id)
+            if self._locks.get(lottery_id) is lock:
+                del self._locks[lottery_id]
+
+        return bitmap
+
+    def mark_taken(self, lottery_id: int, numbers: Iterable[int]):
+        self._apply(lottery_id, True, numbers)
+
+    def mark_available(self, lottery_id: int, numbers: Iterable[int]):
+        self._apply(lottery_id, False, numbers)
+
+    def invalidate(self, lottery_id: int):
+        self._bitmaps.pop(lottery_id, None)
+        if lottery_id in self._pending:
+            self._pending[lottery_id] = None
+
+    def clear(self):
+        self._bitmaps.clear()
+        for lottery_id in self._pending:
+            self._pending[lottery_id] = None
+
+    def _apply(self, lottery_id: int, taken: bool, numbers: Iterable[int]):
+        numbers = list(numbers)
+        entry = self._bitmaps.get(lottery_id)
+        if entry is not None:
+            self._update(entry[1], taken, numbers)
+
+        pending = self._pending.get(lottery_id)
+        if pending is not None:
+            pending.append((taken, numbers))
+
+    @staticmethod
+    def _update(bitmap: TicketBitmap, taken: bool, numbers: list[int]):
+        for number in numbers:
+            if taken:
+                bitmap.mark_taken(number)
+            else:
+                bitmap.mark_available(number)
+
+    async def _load_tracked(self, lottery_id: int) -> TicketBitmap:
+        self._pending[lottery_id] = []
+        try:
+            bitmap = await self._load(lottery_id)
+        finally:
+            pending = self._pending.pop(lottery_id)
+
+        if pending is not None:
+            for taken, numbers in pending:
+                self._update(bitmap, taken, numbers)
+            self._bitmaps[lottery_id] = (time.monotonic() + self.ttl, bitmap)
+        return bitmap
+
+    def _fresh(self, lottery_id: int) -> Optional[TicketBitmap]:
+        entry = self._bitmaps.get(lottery_id)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+        return None
+
+    @staticmethod
+    async def _load(lottery_id: int) -> TicketBitmap:
+        now = datetime.now(timezone.utc)
+        numbers = await Ticket.filter(lottery_id=lottery_id) \
+            .filter(Q(owner_id__isnull=True) | Q(expires_at__lt=now)) \
+            .values_list("number", flat=True)
+        return TicketBitmap(numbers)
+
+
+ticket_availability = TicketAvailability(ttl=config.TICKET_AVAILABILITY_TTL_SECONDS)
@@ -0,0 +1,50 @@
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from app.config import config
+
+CountKey = tuple[int, Optional[int], Optional[int]]
+
+
+class TicketCountCache:
+    """Ticket totals per lottery and ``[min_number, max_number]`` filter, kept for ``ttl`` seconds."""
+
+    def __init__(self, ttl: int, max_size: int):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: OrderedDict[CountKey, tuple[float, int]] = OrderedDict()
+
+    def get(self, lottery_id: int, min_number: Optional[int], max_number: Optional[int]) -> Optional[int]:
+        key = (lottery_id, min_number, max_number)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, total = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return total
+
+    def set(self, lottery_id: int, min_number: Optional[int], max_number: Optional[int], total: int):
+        key = (lottery_id, min_number, max_number)
+        self._entries[key] = (time.monotonic() + self.ttl, total)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate_lottery(self, lottery_id: int):
+        for key in [key for key in self._entries if key[0] == lottery_id]:
+            del self._entries[key]
+
+    def clear(self):
+        self._entries.clear()
+
+
+ticket_count_cache = TicketCountCache(
+    ttl=config.TICKET_COUNT_CACHE_TTL_SECONDS,
+    max_size=config.TICKET_COUNT_CACHE_SIZE,
+)
@@ -1,55 +1,83 @@
-import json
-
-from aiogram.utils import web_app
 from fastapi import HTTPException, status
+from tortoise import connections
 
-from app.config import config
-from app.database.models import User, UserProfile
+from app.auth.init_data import (
+    ExpiredInitData,
+    InvalidInitData,
+    InvalidInitDataSignature,
+    init_data_validator,
+)
 from app.auth.jwt import create_access_token, create_refresh_token
 
 
+# Creates or returns the user together with its profile in one statement.
+# The no-op DO UPDATE makes RETURNING yield the existing row on conflict, so
+# concurrent logins of the same Telegram user resolve to the same pair.
+UPSERT_USER_WITH_PROFILE_SQL = """
+WITH u AS (
+    INSERT INTO "user" (telegram, first_name, last_name, username, photo, registered_at)
+    VALUES ($1, $2, $3, $4, $5, CURRENT_TIMESTAMP)
+    ON CONFLICT (telegram) DO UPDATE SET telegram = EXCLUDED.telegram
+    RETURNING id, telegram, first_name, username
+), new_profile AS (
+    INSERT INTO userprofile (user_id)
+    SELECT id FROM u
+    ON CONFLICT (user_id) DO NOTHING
+    RETURNING user_id, full_name, phone_number, inn, wallet_address
+), profile AS (
+    SELECT user_id, full_name, phone_number, inn, wallet_address FROM new_profile
+    UNION ALL
+    SELECT user_id, full_name, phone_number, inn, wallet_address FROM userprofile
+    WHERE user_id = (SELECT id FROM u)
+)
+SELECT u.id, u.telegram, u.first_name, u.username,
+       p.full_name, p.phone_number, p.inn, p.wallet_address
+FROM u LEFT JOIN profile p ON p.user_id = u.id
+LIMIT 1
+"""
+
+
+async def upsert_user_with_profile(tg_user) -> dict:
+    rows = await connections.get("default").execute_query_dict(
+        UPSERT_USER_WITH_PROFILE_SQL,
+        [tg_user.id, tg_user.first_name, tg_user.last_name, tg_user.username, tg_user.photo_url],
+    )
+    return rows[0]
+
+
 async def login_by_init_data(init_data: str) -> dict:
     try:
-        parsed_data = web_app.parse_webapp_init_data(init_data, loads=json.loads)
-    except Exception:
+        parsed_data = init_data_validator.validate(init_data)
+    except InvalidInitData:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid init data"
         )
-
-    if not web_app.check_webapp_signature(config.TG_BOT_TOKEN, init_data):
+    except InvalidInitDataSignature:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid init data signature"
         )
-
-    tg_user = parsed_data.user
-    user = await User.filter(telegram=tg_user.id).select_related("profile").first()
-
-    if not user:
-        user = await User.create(
-            telegram=tg_user.id,
-            first_name=tg_user.first_name,
-            last_name=tg_user.last_name,
-            username=tg_user.username,
-            photo=tg_user.photo_url,
+    except ExpiredInitData:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Init data expired"
         )
 
-        await UserProfile.create(user=user)
-        await user.fetch_related("profile")
+    row = await upsert_user_with_profile(parsed_data.user)
 
     user_data = {
-        "id": user.id,
-        "telegramId": user.telegram,
-        "telegramUsername": user.username,
-        "telegramName": user.first_name,
-        "fullName": user.profile.full_name if user.profile else None,
-        "phoneNumber": user.profile.phone_number if user.profile else None,
-        "inn": user.profile.inn if user.profile else None,
-        "tonAddress": user.profile.wallet_address if user.profile else None,
+        "id": row["id"],
+        "telegramId": row["telegram"],
+        "telegramUsername": row["username"],
+        "telegramName": row["first_name"],
+        "fullName": row["full_name"],
+        "phoneNumber": row["phone_number"],
+        "inn": row["inn"],
+        "tonAddress": row["wallet_address"],
     }
 
-    payload = {"sub": str(user.id)}
+    payload = {"sub": str(row["id"])}
     access = create_access_token(payload)
     refresh = create_refresh_token(payload)
 
@@ -0,0 +1,183 @@
+import asyncio
+import json
+from typing import Optional
+
+from starlette.websockets import WebSocket, WebSocketDisconnect, WebSocketState
+
+from app.config import config
+from app.database.models import UserPrizes
+from app.schemas.lottery_schema import WinnerItem, WinnerUpdate
+
+HEARTBEAT_FRAME = json.dumps({"type": "heartbeat"})
+
+
+class Subscriber:
+    """A socket with its own bounded queue of outgoing frames."""
+
+    def __init__(self, websocket: WebSocket, queue_size: int, send_timeout: float):
+        self.websocket = websocket
+        self.send_timeout = send_timeout
+        self.dropped = 0
+        self._queue: asyncio.Queue[str] = asyncio.Queue(maxsize=queue_size)
+
+    def offer(self, frame: str):
+        """Queues ``frame``, dropping the oldest pending frame if the client is behind."""
+        if self._queue.full():
+            try:
+                self._queue.get_nowait()
+                self.dropped += 1
+            except asyncio.QueueEmpty:
+                pass
+        self._queue.put_nowait(frame)
+
+    def is_idle(self) -> bool:
+        return self._queue.empty()
+
+    async def send_until_stalled(self):
+        """Sends queued frames; returns once a send exceeds ``send_timeout`` or the client is gone."""
+        while True:
+            frame = await self._queue.get()
+            try:
+                await asyncio.wait_for(self.websocket.send_text(frame), timeout=self.send_timeout)
+            except (asyncio.TimeoutError, WebSocketDisconnect):
+                return
+
+    async def receive_until_disconnect(self):
+        while True:
+            message = await self.websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+
+
+class WinnersHub:
+    """
+    Keeps winners sockets open per lottery and pushes ``winner_update``
+    frames to them.
+
+    The winners query runs once per change and its serialized frame is
+    shared by every subscriber of the lottery.
+    """
+
+    def __init__(self, queue_size: int, heartbeat_interval: float, send_timeout: float):
+        self.queue_size = queue_size
+        self.heartbeat_interval = heartbeat_interval
+        self.send_timeout = send_timeout
+        self._subscribers: dict[int, set[Subscriber]] = {}
+        self._frames: dict[int, str] = {}
+        self._load_locks: dict[int, asyncio.Lock] = {}
+        self._generations: dict[int, int] = {}
+        self._dirty: set[int] = set()
+        self._publishers: dict[int, asyncio.Task] = {}
+        self._heartbeat: Optional[asyncio.Task] = None
+
+    def subscriber_count(self, lottery_id: Optional[int] = None) -> int:
+        if lottery_id is not None:
+            return len(self._subscribers.get(lottery_id, ()))
+        return sum(len(s) for s in self._subscribers.values())
+
+    async def serve(self, websocket: WebSocket, lottery_id: int):
+        """Streams winners to an accepted ``websocket`` until it disconnects."""
+        subscriber = Subscriber(websocket, self.queue_size, self.send_timeout)
+        self._subscribers.setdefault(lottery_id, set()).add(subscriber)
+        self._ensure_heartbeat()
+
+        tasks = []
+        try:
+            subscriber.offer(await self._frame(lottery_id))
+            tasks = [
+                asyncio.create_task(subscriber.send_until_stalled()),
+                asyncio.create_task(subscriber.receive_until_disconnect()),
+            ]
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if not task.cancelled() and task.exception() is not None:
+                    raise task.exception()
+        finally:
+            for task in tasks:
+                task.cancel()
+            self._unsubscribe(lottery_id, subscriber)
+            if websocket.application_state == WebSocketState.CONNECTED \
+                    and websocket.client_state == WebSocketState.CONNECTED:
+                await websocket.close()
+
+    def notify(self, lottery_id: int):
+        """Marks the winners of ``lottery_id`` as changed and pushes them to subscribers."""
+        self._generations[lottery_id] = self._generations.get(lottery_id, 0) + 1
+        self._frames.pop(lottery_id, None)
+        if not self._subscribers.get(lottery_id):
+            return
+
+        self._dirty.add(lottery_id)
+        if lottery_id not in self._publishers:
+            self._publishers[lottery_id] = asyncio.create_task(self._publish(lottery_id))
+
+    async def _publish(self, lottery_id: int):
+        try:
+            while lottery_id in self._dirty:
+                self._dirty.discard(lottery_id)
+                frame = await self._frame(lottery_id)
+                for subscriber in list(self._subscribers.get(lottery_id, ())):
+                    subscriber.offer(frame)
+        finally:
+            self._publishers.pop(lottery_id, None)
+
+    async def _frame(self, lottery_id: int) -> str:
+        frame = self._frames.get(lottery_id)
+        if frame is not None:
+            return frame
+
+        lock = self._load_locks.setdefault(lottery_id, asyncio.Lock())
+        async with lock:
+            frame = self._frames.get(lottery_id)
+            if frame is None:
+                # A load that overlaps ``notify`` may have read the old winners;
+                # hand it to the caller but leave the cache for the reload. A
+                # replaced lock means the lottery's state was dropped meanwhile.
+                generation = self._generations.get(lottery_id, 0)
+                frame = await self._load(lottery_id)
+                if self._subscribers.get(lottery_id) and self._load_locks.get(lottery_id) is lock \
+                        and self._generations.get(lottery_id, 0) == generation:
+                    self._frames[lottery_id] = frame
+        return frame
+
+    @staticmethod
+    async def _load(lottery_id: int) -> str:
+        rows = await UserPrizes \
+            .filter(prize__lottery_prizes__lottery_id=lottery_id) \
+            .values("prize_id", "prize__title", "user_id")
+
+        return WinnerUpdate(winners=[
+            WinnerItem(prize_id=row["prize_id"], title=row["prize__title"], user_id=row["user_id"])
+            for row in rows
+        ]).model_dump_json()
+
+    def _unsubscribe(self, lottery_id: int, subscriber: Subscriber):
+        subscribers = self._subscribers.get(lottery_id)
+        if subscribers is None:
+            return
+
+        subscribers.discard(subscriber)
+        if not subscribers:
+            del self._subscribers[lottery_id]
+            self._frames.pop(lottery_id, None)
+            self._load_locks.pop(lottery_id, None)
+            self._generations.pop(lottery_id, None)
+
+    def _ensure_heartbeat(self):
+        if self._heartbeat is None or self._heartbeat.done():
+            self._heartbeat = asyncio.create_task(self._send_heartbeats())
+
+    async def _send_heartbeats(self):
+        while self._subscribers:
+            await asyncio.sleep(self.heartbeat_interval)
+            for subscribers in list(self._subscribers.values()):
+                for subscriber in list(subscribers):
+                    if subscriber.is_idle():
+                        subscriber.offer(HEARTBEAT_FRAME)
+
+
+winners_hub = WinnersHub(
+    queue_size=config.WS_SEND_QUEUE_SIZE,
+    heartbeat_interval=config.WS_HEARTBEAT_SECONDS,
+    send_timeout=config.WS_SEND_TIMEOUT_SECONDS,
+)
@@ -0,0 +1,64 @@
+"""
+Compares the admin lottery list/history pages against the former ticket prefetch.
+
+    python -m benchmarks.bench_admin_lists --lotteries 10 --tickets 50000
+"""
+import argparse
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from app.database.models import Lottery
+from app.routes.admin_router import get_lottery_history, get_lottery_list
+from app.schemas.lottery_schema import IPageRequest
+from app.services.counters_service import refresh_counters
+from benchmarks.common import database, drop_seed, measure, seed_lottery
+
+
+async def legacy_lottery_list(limit: int):
+    lotteries = await Lottery.all().order_by("-event_date").limit(limit).prefetch_related("tickets")
+    return [len(l.tickets) for l in lotteries]
+
+
+async def legacy_lottery_history(limit: int):
+    now = datetime.now(timezone.utc)
+    lotteries = await Lottery.filter(event_date__lt=now).order_by("-event_date").limit(limit) \
+        .prefetch_related("tickets")
+    return [len(l.tickets) for l in lotteries]
+
+
+async def main(lotteries: int, tickets: int, repeat: int):
+    async with database():
+        seeded = [await seed_lottery(tickets, buyers=100)]
+        for _ in range(lotteries - 1):
+            seeded.append(await seed_lottery(tickets, buyers=0, sold_ratio=0))
+        ids = [l.id for l in seeded]
+        await Lottery.filter(id__in=ids).update(
+            is_active=False, event_date=datetime.now(timezone.utc) - timedelta(days=1)
+        )
+        await refresh_counters(ids)
+        try:
+            print(f"seeded {lotteries} lotteries x {tickets} tickets")
+            await measure("list: legacy ticket prefetch", lambda: legacy_lottery_list(lotteries), repeat)
+            await measure(
+                "list: counters",
+                lambda: get_lottery_list(IPageRequest(page=1, limit=lotteries), user=None),
+                repeat
+            )
+            await measure("history: legacy ticket prefetch", lambda: legacy_lottery_history(lotteries), repeat)
+            await measure(
+                "history: counters",
+                lambda: get_lottery_history(page=1, limit=lotteries, q=None, user=None),
+                repeat
+            )
+        finally:
+            for lottery in seeded:
+                await drop_seed(lottery)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lotteries", type=int, default=10)
+    parser.add_argument("--tickets", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.lotteries, args.tickets, args.repeat))
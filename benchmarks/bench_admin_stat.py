@@ -0,0 +1,53 @@
+"""
+Compares the aggregated /admin/stat query against the former per-ticket loop.
+
+    python -m benchmarks.bench_admin_stat --tickets 200000 --buyers 5000
+"""
+import argparse
+import asyncio
+from datetime import datetime, timezone
+
+from app.database.models import Lottery, Option, Ticket, User
+from app.services.admin_service import get_admin_statistics
+from benchmarks.common import database, drop_seed, measure, seed_lottery
+
+
+async def legacy_admin_statistics():
+    await User.all().count()
+    await Ticket.all().count()
+    await Ticket.exclude(owner=None).count()
+    tickets_earn = 0
+    async for t in Ticket.exclude(owner=None).select_related("lottery"):
+        tickets_earn += t.lottery.ticket_price
+
+    now = datetime.now(timezone.utc)
+    active_lottery = await Lottery.filter(is_active=True, event_date__gte=now).first()
+    if active_lottery:
+        await Ticket.filter(lottery=active_lottery).count()
+        await Ticket.filter(lottery=active_lottery).exclude(owner=None).count()
+        users = await Ticket.filter(lottery=active_lottery).exclude(owner=None) \
+            .distinct().values_list("owner_id", flat=True)
+        len(users)
+    await Option.get(key="liveStatus")
+
+
+async def main(tickets: int, buyers: int, repeat: int):
+    async with database():
+        await Option.get_or_create(key="liveStatus", defaults={"title": "Live status", "value": "0"})
+        await Lottery.filter(is_active=True).update(is_active=False)
+        lottery = await seed_lottery(tickets, buyers)
+        try:
+            print(f"seeded {tickets} tickets, {buyers} buyers")
+            await measure("legacy python loop", legacy_admin_statistics, repeat)
+            await measure("sql aggregation", get_admin_statistics, repeat)
+        finally:
+            await drop_seed(lottery)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tickets", type=int, default=100_000)
+    parser.add_argument("--buyers", type=int, default=2_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.tickets, args.buyers, args.repeat))
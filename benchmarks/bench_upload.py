@@ -0,0 +1,56 @@
+"""
+Compares peak memory of the streaming FileUpload against reading the whole upload.
+
+    python -m benchmarks.bench_upload --sizes 1 64 256
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+
+import aiofiles
+from starlette.datastructures import UploadFile
+
+from app.services.file_upload import FileUpload
+from benchmarks.common import measure
+
+MIB = 1024 ** 2
+
+
+async def legacy_upload(file: UploadFile, uploads_dir: str):
+    content = await file.read()
+    async with aiofiles.open(os.path.join(uploads_dir, "legacy.bin"), "wb") as f:
+        await f.write(content)
+
+
+async def main(sizes: list[int], repeat: int):
+    with tempfile.TemporaryDirectory() as uploads_dir:
+        upload = FileUpload(uploads_dir=uploads_dir, prefix="/uploads/", filename_generator=lambda f: "stream.bin")
+        for size in sizes:
+            source_path = os.path.join(uploads_dir, "source.bin")
+            with open(source_path, "wb") as source:
+                for _ in range(size):
+                    source.write(os.urandom(MIB))
+
+            with open(source_path, "rb") as source:
+                file = UploadFile(file=source, filename="source.bin")
+
+                async def run_legacy():
+                    source.seek(0)
+                    await legacy_upload(file, uploads_dir)
+
+                async def run_streaming():
+                    source.seek(0)
+                    await upload.upload(file)
+
+                print(f"{size} MiB upload")
+                await measure("  read whole file", run_legacy, repeat)
+                await measure("  streaming", run_streaming, repeat)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 64, 256])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(main(args.sizes, args.repeat))
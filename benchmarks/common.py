@@ -0,0 +1,81 @@
+import time
+import tracemalloc
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+
+from tortoise import Tortoise
+
+from app.config import TORTOISE_ORM
+from app.database.models import Lottery, Ticket, User
+
+SEED_TELEGRAM_BASE = 10 ** 13
+
+
+@asynccontextmanager
+async def database():
+    await Tortoise.init(config=TORTOISE_ORM)
+    await Tortoise.generate_schemas(safe=True)
+    try:
+        yield
+    finally:
+        await Tortoise.close_connections()
+
+
+async def seed_lottery(tickets: int, buyers: int, sold_ratio: float = 0.5, batch_size: int = 5000) -> Lottery:
+    """Creates an active lottery with ``tickets`` tickets, ``sold_ratio`` of them owned."""
+    now = datetime.now(timezone.utc)
+    lottery = await Lottery.create(
+        name="Benchmark", banner="b", short_description="s", total_sum=1000,
+        event_date=now + timedelta(days=1), is_active=True,
+        collection_name="bench", collection_address="addr", collection_banner="cb",
+        ticket_price=10.0,
+    )
+
+    base_telegram = SEED_TELEGRAM_BASE + int(time.time()) % 10 ** 6 * 10 ** 6
+    await User.bulk_create([
+        User(telegram=base_telegram + i, first_name=f"Buyer {i}") for i in range(buyers)
+    ])
+    owner_ids = await User.filter(telegram__gte=base_telegram).values_list("id", flat=True)
+
+    sold = int(tickets * sold_ratio)
+    batch = []
+    for number in range(1, tickets + 1):
+        batch.append(Ticket(
+            lottery_id=lottery.id,
+            owner_id=owner_ids[number % len(owner_ids)] if number <= sold else None,
+            number=number,
+            name=f"NFT #{number}",
+            image="https://example.com/image.png",
+            address=f"TON{number}",
+        ))
+        if len(batch) >= batch_size:
+            await Ticket.bulk_create(batch)
+            batch = []
+    if batch:
+        await Ticket.bulk_create(batch)
+
+    return lottery
+
+
+async def drop_seed(lottery: Lottery):
+    await Ticket.filter(lottery_id=lottery.id).delete()
+    await User.filter(telegram__gte=SEED_TELEGRAM_BASE, first_name__startswith="Buyer ").delete()
+    await lottery.delete()
+
+
+async def measure(label: str, fn, repeat: int = 5):
+    """Runs ``fn`` ``repeat`` times and prints latency and peak Python heap usage."""
+    timings = []
+    peak = 0
+    for _ in range(repeat):
+        tracemalloc.start()
+        started = time.perf_counter()
+        await fn()
+        timings.append(time.perf_counter() - started)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+
+    best = min(timings) * 1000
+    mean = sum(timings) / len(timings) * 1000
+    print(f"{label:<40} best {best:9.2f} ms   mean {mean:9.2f} ms   peak {peak / 1024 ** 2:8.2f} MiB")
+    return timings
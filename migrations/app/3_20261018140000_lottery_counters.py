@@ -0,0 +1,50 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE TABLE IF NOT EXISTS "lotterycounters" (
+    "id" BIGSERIAL NOT NULL PRIMARY KEY,
+    "ticket_count" INT NOT NULL DEFAULT 0,
+    "sold_count" INT NOT NULL DEFAULT 0,
+    "revenue" DECIMAL(14,2) NOT NULL DEFAULT 0,
+    "participants" INT NOT NULL DEFAULT 0,
+    "total_nft_count" INT NOT NULL DEFAULT 0,
+    "available_nft_count" INT NOT NULL DEFAULT 0,
+    "updated_at" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "lottery_id" INT NOT NULL UNIQUE REFERENCES "lottery" ("id") ON DELETE CASCADE
+);
+        INSERT INTO "lotterycounters" (
+    "lottery_id", "ticket_count", "sold_count", "revenue", "participants",
+    "total_nft_count", "available_nft_count", "updated_at"
+)
+SELECT
+    l.id,
+    t.ticket_count,
+    t.sold_count,
+    t.sold_count * l.ticket_price,
+    t.participants,
+    p.total_nft_count,
+    p.total_nft_count - p.used_nft_count,
+    CURRENT_TIMESTAMP
+FROM "lottery" l
+CROSS JOIN LATERAL (
+    SELECT COUNT(*) AS ticket_count,
+           COUNT(owner_id) AS sold_count,
+           COUNT(DISTINCT owner_id) AS participants
+    FROM "ticket"
+    WHERE lottery_id = l.id
+) t
+CROSS JOIN LATERAL (
+    SELECT COUNT(*) AS total_nft_count,
+           (SELECT COUNT(*) FROM "userprizes" up
+            WHERE up.prize_id IN (SELECT prize_id FROM "lotteryprizes" WHERE lottery_id = l.id)) AS used_nft_count
+    FROM "lotteryprizes"
+    WHERE lottery_id = l.id
+) p
+ON CONFLICT ("lottery_id") DO NOTHING;"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP TABLE IF EXISTS "lotterycounters";"""
@@ -1,10 +1,19 @@
+import logging
 import pytest
 import pytest_asyncio
 
+from contextlib import contextmanager
+
 from httpx import AsyncClient, ASGITransport
 from tortoise import Tortoise
 
+from app.auth.identity_cache import identity_cache
+from app.auth.init_data import init_data_validator
 from app.main import app
+from app.services.live_status import live_status_cache
+from app.services.lottery_snapshot import active_lottery_snapshot
+from app.services.ticket_availability import ticket_availability
+from app.services.ticket_count_cache import ticket_count_cache
 from app.config import config
 from unittest.mock import patch
 
@@ -22,6 +31,12 @@ async def initialize_tests():
     )
     await Tortoise.generate_schemas()
     await truncate_tables()
+    identity_cache.clear()
+    init_data_validator.clear()
+    active_lottery_snapshot.invalidate()
+    live_status_cache.invalidate()
+    ticket_count_cache.clear()
+    ticket_availability.clear()
     yield
     await Tortoise.close_connections()
 
@@ -35,5 +50,19 @@ async def client():
 
 @pytest.fixture(autouse=True)
 def mock_signature_check():
-    with patch("app.services.users_service.web_app.check_webapp_signature", return_value=True):
+    with patch("app.auth.init_data.InitDataValidator.check_signature", return_value=True):
         yield
+
+
+@pytest.fixture
+def count_queries(caplog):
+    """Collects the statements sent through Tortoise inside a ``with`` block."""
+    @contextmanager
+    def counter():
+        queries = []
+        with caplog.at_level(logging.DEBUG, logger="tortoise.db_client"):
+            caplog.clear()
+            yield queries
+            queries.extend(r.getMessage() for r in caplog.records if r.name == "tortoise.db_client")
+
+    return counter
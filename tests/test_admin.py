@@ -1,12 +1,12 @@
 import pytest
+import time
 
 from httpx import AsyncClient
 from app.database.models import User
 
-VALID_INIT_DATA = (
-    "query_id=AAAA1&user=%7B%22id%22%3A123456789%2C%22first_name%22%3A%22Admin%22%2C"
-    "%22username%22%3A%22adminuser%22%7D&auth_date=1700000000&hash=securehash"
-)
+USER = "%7B%22id%22%3A123456789%2C%22first_name%22%3A%22Admin%22%2C%22username%22%3A%22adminuser%22%7D"
+VALID_INIT_DATA = f"query_id=AAAA1&user={USER}&auth_date={int(time.time())}&hash=securehash"
+STALE_INIT_DATA = f"query_id=AAAA1&user={USER}&auth_date=1700000000&hash=securehash"
 
 
 @pytest.mark.asyncio
@@ -27,3 +27,14 @@ async def test_admin_login_success(client: AsyncClient):
     assert user is not None
     assert user.username == "adminuser"
     assert user.first_name == "Admin"
+
+
+@pytest.mark.asyncio
+async def test_admin_login_rejects_stale_init_data(client: AsyncClient):
+    response = await client.post(
+        "/admin/login",
+        data={"init_data": STALE_INIT_DATA},
+    )
+
+    assert response.status_code == 401
+    assert await User.get_or_none(telegram=123456789) is None
@@ -5,6 +5,7 @@ from datetime import datetime, timedelta, timezone
 
 from app.auth.jwt import create_access_token
 from app.database.models.lottery import Lottery
+from app.database.models.ticket import Ticket
 from app.database.models.users import User
 
 
@@ -33,4 +34,30 @@ async def test_get_lottery_list(client: AsyncClient):
     assert data["success"] is True
     assert data["page"] == 1
     assert data["totalPages"] == 2
-    assert len(data["lotteries"]) == 2
\ No newline at end of file
+    assert len(data["lotteries"]) == 2
+
+@pytest.mark.asyncio
+async def test_get_lottery_list_counts_tickets(client: AsyncClient):
+    user = await User.create(telegram=123457, first_name="Admin")
+    token = create_access_token({"sub": str(user.id)})
+
+    lottery = await Lottery.create(
+        name="Counted",
+        banner="banner", short_description="desc", total_sum=100,
+        event_date=datetime.now(timezone.utc) + timedelta(days=1),
+        is_active=False,
+        collection_name="col", collection_address="addr", collection_banner="cb",
+        ticket_price=10.0
+    )
+    await Ticket.bulk_create([
+        Ticket(lottery=lottery, number=i, name=f"NFT #{i}", image="img", address=f"TON{i}")
+        for i in range(1, 6)
+    ])
+
+    response = await client.get(
+        "/admin/lotteries/?page=1&limit=10",
+        headers={"Authorization": f"Bearer {token}"}
+    )
+
+    assert response.status_code == 200
+    assert response.json()["lotteries"][0]["totalNftCount"] == 5
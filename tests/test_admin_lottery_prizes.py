@@ -0,0 +1,100 @@
+import pytest
+
+from datetime import datetime, timedelta, timezone
+from httpx import AsyncClient
+
+from app.auth.identity_cache import identity_cache
+from app.auth.jwt import create_access_token
+from app.database.models import User, Lottery, LotteryPrizes, Prize, UserPrizes
+
+
+def lottery_payload(prize_count: int) -> dict:
+    prize = {"image": "img", "description": "d", "quantity": 1, "winners": []}
+    return {
+        "name": "Bulk", "shortDescription": "s", "banner": "b", "collectionBanner": "cb",
+        "eventDate": int((datetime.now(timezone.utc) + timedelta(days=1)).timestamp()),
+        "totalSum": 100, "ticketPrice": 10.0, "collectionName": "col",
+        "mainBanner": "m", "headerBanner": "h",
+        "grandPrizes": [{**prize, "title": "Grand"}],
+        "prizes": [{**prize, "title": f"Prize {i}"} for i in range(prize_count - 1)],
+    }
+
+
+@pytest.mark.asyncio
+async def test_create_lottery_saves_prizes_in_constant_queries(client: AsyncClient, count_queries):
+    admin = await User.create(telegram=960001, first_name="Admin")
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': str(admin.id)})}"}
+
+    counts = []
+    for prize_count in (2, 200):
+        identity_cache.clear()
+        with count_queries() as queries:
+            response = await client.post("/admin/lotteries/", json=lottery_payload(prize_count), headers=headers)
+        assert response.status_code == 200
+        counts.append(len(queries))
+
+        lottery_id = response.json()["lottery"]["id"]
+        assert await LotteryPrizes.filter(lottery_id=lottery_id).count() == prize_count
+        assert await Prize.filter(lottery_prizes__lottery_id=lottery_id, type="grand").count() == 1
+
+    assert counts[0] == counts[1]
+
+
+@pytest.mark.asyncio
+async def test_update_lottery_replaces_prizes_in_constant_queries(client: AsyncClient, count_queries):
+    admin = await User.create(telegram=960002, first_name="Admin")
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': str(admin.id)})}"}
+    lottery = await Lottery.create(
+        name="Old", banner="b", short_description="s", total_sum=100,
+        event_date=datetime.now(timezone.utc) + timedelta(days=1), is_active=False,
+        collection_name="col", collection_address="addr", collection_banner="cb",
+        ticket_price=10.0
+    )
+
+    counts = []
+    for prize_count in (2, 200):
+        identity_cache.clear()
+        with count_queries() as queries:
+            response = await client.put(
+                f"/admin/lotteries/{lottery.id}", json=lottery_payload(prize_count), headers=headers
+            )
+        assert response.status_code == 200
+        counts.append(len(queries))
+        assert await LotteryPrizes.filter(lottery_id=lottery.id).count() == prize_count
+
+    assert counts[0] == counts[1]
+    assert await Prize.all().count() == 200
+
+
+@pytest.mark.asyncio
+async def test_update_lottery_updates_prizes_in_place(client: AsyncClient):
+    admin = await User.create(telegram=960003, first_name="Admin")
+    winner = await User.create(telegram=960004, first_name="Winner")
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': str(admin.id)})}"}
+
+    response = await client.post("/admin/lotteries/", json=lottery_payload(3), headers=headers)
+    lottery_id = response.json()["lottery"]["id"]
+    grand = await Prize.get(lottery_prizes__lottery_id=lottery_id, type="grand")
+    won = await Prize.get(lottery_prizes__lottery_id=lottery_id, title="Prize 0")
+    dropped = await Prize.get(lottery_prizes__lottery_id=lottery_id, title="Prize 1")
+    await UserPrizes.create(user=winner, prize=won)
+
+    payload = lottery_payload(1)
+    payload["grandPrizes"][0].update(id=grand.id, title="Renamed")
+    payload["prizes"] = [{**payload["grandPrizes"][0], "id": None, "title": "New"}]
+    response = await client.put(f"/admin/lotteries/{lottery_id}", json=payload, headers=headers)
+
+    assert response.status_code == 200
+    await grand.refresh_from_db()
+    assert grand.title == "Renamed"
+    assert await Prize.filter(id=dropped.id).count() == 0
+    assert await UserPrizes.filter(user=winner, prize_id=won.id).count() == 1
+    assert await Prize.filter(lottery_prizes__lottery_id=lottery_id, title="New").count() == 1
+
+    other = await Prize.create(title="Other", type="common", description="d", quantity=1, image="i")
+    payload["grandPrizes"][0]["id"] = other.id
+    response = await client.put(f"/admin/lotteries/{lottery_id}", json=payload, headers=headers)
+
+    assert response.status_code == 404
+    await grand.refresh_from_db()
+    assert grand.title == "Renamed"
@@ -1,8 +1,11 @@
 import pytest
 
+from datetime import datetime, timedelta, timezone
 from httpx import AsyncClient
+from tortoise.transactions import in_transaction
 from app.auth.jwt import create_access_token
-from app.database.models import User
+from app.database.models import User, Lottery, Ticket, Option
+from app.services.counters_service import refresh_counters
 
 
 @pytest.mark.asyncio
@@ -32,3 +35,45 @@ async def test_get_admin_stat(client: AsyncClient):
     assert "activeLotterySoldTicketsCount" in stat
     assert "activeLotteryTicketsCount" in stat
     assert "activeLotteryTicketsEarn" in stat
+
+
+@pytest.mark.asyncio
+async def test_get_admin_stat_aggregates_sales(client: AsyncClient):
+    admin = await User.create(telegram=999998, first_name="Admin")
+    buyer_1 = await User.create(telegram=999997, first_name="Buyer 1")
+    buyer_2 = await User.create(telegram=999996, first_name="Buyer 2")
+    token = create_access_token({"sub": str(admin.id)})
+    now = datetime.now(timezone.utc)
+    await Option.create(title="Live status", key="liveStatus", value="0")
+
+    active = await Lottery.create(
+        name="Active", banner="b", short_description="s", total_sum=100,
+        event_date=now + timedelta(days=1), is_active=True,
+        collection_name="col", collection_address="addr", collection_banner="cb",
+        ticket_price=10.0
+    )
+    past = await Lottery.create(
+        name="Past", banner="b", short_description="s", total_sum=100,
+        event_date=now - timedelta(days=1), is_active=False,
+        collection_name="col", collection_address="addr", collection_banner="cb",
+        ticket_price=5.0
+    )
+
+    owners = [buyer_1, buyer_1, buyer_2, None]
+    for i, owner in enumerate(owners):
+        await Ticket.create(lottery=active, number=i + 1, name="n", image="i", address="a", owner=owner)
+    await Ticket.create(lottery=past, number=1, name="n", image="i", address="a", owner=buyer_2)
+    await Ticket.create(lottery=past, number=2, name="n", image="i", address="a", owner=None)
+    async with in_transaction() as connection:
+        await refresh_counters([active.id, past.id], connection)
+
+    response = await client.get("/admin/stat", headers={"Authorization": f"Bearer {token}"})
+
+    assert response.status_code == 200
+    stat = response.json()["stat"]
+    assert stat["usersCount"] == 3
+    assert stat["ticketsEarn"] == 35.0
+    assert stat["activeLotteryParticipants"] == 2
+    assert stat["activeLotterySoldTicketsCount"] == 3
+    assert stat["activeLotteryTicketsCount"] == 4
+    assert stat["activeLotteryTicketsEarn"] == 30.0
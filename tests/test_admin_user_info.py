@@ -3,6 +3,7 @@ import pytest
 from httpx import AsyncClient
 from datetime import datetime, timedelta, timezone
 
+from app.auth.identity_cache import identity_cache
 from app.auth.jwt import create_access_token
 from app.database.models import User, UserProfile, Ticket, Prize, UserPrizes, Lottery, LotteryPrizes
 
@@ -46,4 +47,43 @@ async def test_get_user_info_returns_correct_data(client: AsyncClient):
     assert data["success"] is True
     assert data["user"]["telegramId"] == user.telegram
     assert data["nfts"]
-    assert data["prizes"]
\ No newline at end of file
+    assert data["prizes"]
+
+@pytest.mark.asyncio
+async def test_get_user_info_queries_do_not_grow_with_prizes(client: AsyncClient, count_queries):
+    admin = await User.create(telegram=123124, first_name="Admin")
+    token = create_access_token({"sub": str(admin.id)})
+
+    lottery = await Lottery.create(
+        name="Prize Lottery",
+        banner="b", short_description="s", total_sum=100,
+        event_date=datetime.now(timezone.utc) + timedelta(days=1),
+        is_active=False,
+        collection_name="col", collection_address="addr", collection_banner="cb",
+        ticket_price=10.0
+    )
+
+    counts = []
+    for telegram, prize_count in ((123125, 1), (123126, 30)):
+        user = await User.create(telegram=telegram, first_name="Winner")
+        await UserProfile.create(user=user, full_name="Winner")
+        for i in range(prize_count):
+            await Ticket.create(
+                lottery=lottery, number=telegram * 100 + i, name=f"NFT {i}",
+                image="img.png", address="ADDR", owner=user
+            )
+            prize = await Prize.create(title=f"Prize {i}", type="nft", description="desc", quantity=1, image="img.png")
+            await LotteryPrizes.create(lottery=lottery, prize=prize)
+            await UserPrizes.create(user=user, prize=prize)
+
+        identity_cache.clear()
+        with count_queries() as queries:
+            response = await client.get(f"/admin/users/{user.id}", headers={"Authorization": f"Bearer {token}"})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data["prizes"]) == prize_count
+        assert all(p["eventDate"] == int(lottery.event_date.timestamp()) for p in data["prizes"])
+        counts.append(len(queries))
+
+    assert counts[0] == counts[1]
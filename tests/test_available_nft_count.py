@@ -0,0 +1,42 @@
+import pytest
+
+from datetime import datetime, timedelta, timezone
+from tortoise.transactions import in_transaction
+
+from app.database.models import User, Lottery, Prize, LotteryPrizes, UserPrizes
+from app.services.counters_service import get_counters, get_counters_many, refresh_counters
+
+
+async def create_lottery_with_prizes(name: str, prizes: int) -> tuple[Lottery, list[Prize]]:
+    lottery = await Lottery.create(
+        name=name, banner="b", short_description="s", total_sum=100,
+        event_date=datetime.now(timezone.utc) + timedelta(days=1), is_active=False,
+        collection_name="col", collection_address="addr", collection_banner="cb",
+        ticket_price=10.0
+    )
+    created = []
+    for i in range(prizes):
+        prize = await Prize.create(title=f"{name} {i}", type="nft", description="d", quantity=1, image="i")
+        await LotteryPrizes.create(lottery=lottery, prize=prize)
+        created.append(prize)
+    return lottery, created
+
+
+@pytest.mark.asyncio
+async def test_get_available_nft_counts_for_many_lotteries():
+    user = await User.create(telegram=727272, first_name="Winner")
+    first, first_prizes = await create_lottery_with_prizes("First", 3)
+    second, second_prizes = await create_lottery_with_prizes("Second", 2)
+    empty, _ = await create_lottery_with_prizes("Empty", 0)
+
+    await UserPrizes.create(user=user, prize=first_prizes[0])
+    await UserPrizes.create(user=user, prize=second_prizes[0])
+    await UserPrizes.create(user=user, prize=second_prizes[1])
+    async with in_transaction() as connection:
+        await refresh_counters([second.id], connection)
+
+    counters = await get_counters_many([first.id, second.id, empty.id])
+
+    assert {lottery_id: c.available_nft_count for lottery_id, c in counters.items()} == \
+        {first.id: 2, second.id: 0, empty.id: 0}
+    assert (await get_counters(first.id)).available_nft_count == 2
@@ -0,0 +1,89 @@
+import asyncio
+import pytest
+import pytest_asyncio
+
+from httpx import AsyncClient
+from tortoise import Tortoise, connections
+
+from app.auth.jwt import create_access_token
+from app.config import TORTOISE_ORM
+from app.database.models import User
+from app.database.pool import InstrumentedPool, PoolMetrics
+
+
+@pytest_asyncio.fixture
+async def instrumented_db(monkeypatch):
+    """Re-initialises Tortoise with the app's ``app.database.pool`` engine and a two-connection pool."""
+    monkeypatch.setattr("app.database.pool.pool_metrics", PoolMetrics())
+    default = TORTOISE_ORM["connections"]["default"]
+    await Tortoise.close_connections()
+    await Tortoise.init(config={
+        "connections": {
+            "default": {
+                "engine": default["engine"],
+                "credentials": {**default["credentials"], "minsize": 1, "maxsize": 2},
+            },
+        },
+        "apps": {
+            "app": {"models": ["app.database.models"], "default_connection": "default"},
+        },
+    })
+    await User.all().count()
+    pool = connections.get("default")._pool
+    assert isinstance(pool, InstrumentedPool)
+    return pool
+
+
+@pytest.mark.asyncio
+async def test_instrumented_pool_records_acquires_and_waiters(instrumented_db: InstrumentedPool):
+    pool = instrumented_db
+    acquires = pool.metrics.acquires
+
+    connection = await pool.acquire()
+    await pool.release(connection)
+    async with pool.acquire() as connection:
+        assert await connection.fetchval("SELECT 1") == 1
+
+    held = [await pool.acquire() for _ in range(pool.get_max_size())]
+    assert pool.stats()["idle"] == 0
+    waiter = asyncio.create_task(pool._acquire(None))
+    await asyncio.sleep(0.05)
+    assert pool.stats()["waiting"] == 1
+    await pool.release(held.pop())
+    await pool.release(await waiter)
+    for connection in held:
+        await pool.release(connection)
+
+    stats = pool.stats()
+    assert stats["acquires"] == acquires + pool.get_max_size() + 3
+    assert stats["size"] == 2
+    assert stats["idle"] == 2
+    assert stats["waiting"] == 0
+    assert stats["max_waiting"] == 1
+    assert stats["acquire_ms_max"] >= 0
+
+
+@pytest.mark.asyncio
+async def test_pool_diagnostics_endpoint(client: AsyncClient, instrumented_db: InstrumentedPool):
+    user = await User.create(telegram=970001, first_name="Admin")
+    held = await instrumented_db.acquire()
+
+    try:
+        response = await client.get(
+            "/admin/diagnostics/pool",
+            headers={"Authorization": f"Bearer {create_access_token({'sub': str(user.id)})}"}
+        )
+    finally:
+        await instrumented_db.release(held)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["success"] is True
+    pool = data["pool"]
+    assert pool["minSize"] == 1
+    assert pool["maxSize"] == 2
+    assert pool["size"] == 2
+    assert pool["idle"] == 1
+    assert pool["inUse"] == 1
+    assert pool["waiting"] == 0
+    assert pool["acquires"] >= 3
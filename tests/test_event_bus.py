@@ -0,0 +1,63 @@
+import asyncio
+import pytest
+
+from app.config import config
+from app.services.event_bus import EventBus
+
+
+@pytest.mark.asyncio
+async def test_events_reach_other_workers_but_not_the_publisher_twice():
+    channel = "treasure_island_events_test"
+    listener = EventBus(dsn=config.DATABASE_URL, channel=channel, reconnect_delay=0.1)
+    publisher = EventBus(dsn=config.DATABASE_URL, channel=channel, reconnect_delay=0.1)
+
+    received = asyncio.Queue()
+    published = []
+    listener.subscribe("tickets_sold", received.put_nowait)
+    publisher.subscribe("tickets_sold", published.append)
+
+    await listener.start()
+    await publisher.start()
+    try:
+        for _ in range(100):
+            if listener.listening and publisher.listening:
+                break
+            await asyncio.sleep(0.01)
+
+        await publisher.publish("tickets_sold", lottery_id=7, numbers=[1, 2])
+        event = await asyncio.wait_for(received.get(), timeout=5)
+        await asyncio.sleep(0.2)
+    finally:
+        await listener.stop()
+        await publisher.stop()
+
+    assert event == {"lottery_id": 7, "numbers": [1, 2]}
+    assert published == [{"lottery_id": 7, "numbers": [1, 2]}]
+
+
+@pytest.mark.asyncio
+async def test_oversized_events_are_truncated_for_other_workers():
+    channel = "treasure_island_events_test_large"
+    listener = EventBus(dsn=config.DATABASE_URL, channel=channel, reconnect_delay=0.1)
+    publisher = EventBus(dsn=config.DATABASE_URL, channel=channel, reconnect_delay=0.1)
+
+    received = asyncio.Queue()
+    published = []
+    listener.subscribe("tickets_sold", received.put_nowait)
+    publisher.subscribe("tickets_sold", published.append)
+    numbers = list(range(1, 5001))
+
+    await listener.start()
+    try:
+        for _ in range(100):
+            if listener.listening:
+                break
+            await asyncio.sleep(0.01)
+
+        await publisher.publish("tickets_sold", lottery_id=7, numbers=numbers)
+        event = await asyncio.wait_for(received.get(), timeout=5)
+    finally:
+        await listener.stop()
+
+    assert published == [{"lottery_id": 7, "numbers": numbers}]
+    assert event == {"lottery_id": 7, "truncated": True}
@@ -0,0 +1,73 @@
+import asyncio
+import hashlib
+import io
+import os
+import pytest
+
+from starlette.datastructures import UploadFile
+
+from app.services.file_upload import ContentIndex, FileExtNotAllowed, FileMaxSizeLimit, FileUpload
+
+
+def make_upload(content: bytes, filename: str = "banner.png") -> UploadFile:
+    return UploadFile(file=io.BytesIO(content), filename=filename)
+
+
+@pytest.mark.asyncio
+async def test_upload_streams_file_into_uploads_dir(tmp_path):
+    upload = FileUpload(uploads_dir=str(tmp_path), prefix="/uploads/", chunk_size=4)
+
+    url = await upload.upload(make_upload(b"0123456789"))
+
+    filename = url.rsplit("/", 1)[-1]
+    assert filename.endswith(".png")
+    assert (tmp_path / filename).read_bytes() == b"0123456789"
+    assert os.listdir(tmp_path) == [filename]
+
+
+@pytest.mark.asyncio
+async def test_upload_over_limit_is_rejected_without_leftovers(tmp_path):
+    upload = FileUpload(uploads_dir=str(tmp_path), prefix="/uploads/", max_size=8, chunk_size=4)
+
+    with pytest.raises(FileMaxSizeLimit):
+        await upload.upload(make_upload(b"0123456789"))
+
+    assert os.listdir(tmp_path) == []
+
+
+@pytest.mark.asyncio
+async def test_upload_rejects_extensions_outside_allow_list(tmp_path):
+    upload = FileUpload(uploads_dir=str(tmp_path), prefix="/uploads/", allow_extensions=[".png", ".jpg"])
+
+    assert await upload.upload(make_upload(b"img", "banner.jpg"))
+    with pytest.raises(FileExtNotAllowed):
+        await upload.upload(make_upload(b"exe", "banner.exe"))
+
+
+@pytest.mark.asyncio
+async def test_content_addressed_upload_is_deduplicated(tmp_path):
+    upload = FileUpload(uploads_dir=str(tmp_path), prefix="/uploads/", content_addressed=True)
+
+    first = await upload.upload(make_upload(b"same banner", "first.png"))
+    second = await upload.upload(make_upload(b"same banner", "second.png"))
+    other = await upload.upload(make_upload(b"other banner", "third.png"))
+
+    assert first == second
+    assert first != other
+    assert first.endswith(f"{hashlib.sha256(b'same banner').hexdigest()}.png")
+    assert sorted(os.listdir(tmp_path)) == sorted([
+        ".content-index", first.rsplit("/", 1)[-1], other.rsplit("/", 1)[-1]
+    ])
+
+    fresh_index = ContentIndex(str(tmp_path / ".content-index"))
+    assert await fresh_index.get(hashlib.sha256(b"other banner").hexdigest()) == other.rsplit("/", 1)[-1]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_uploads_of_new_content_add_one_index_entry(tmp_path):
+    upload = FileUpload(uploads_dir=str(tmp_path), prefix="/uploads/", content_addressed=True, chunk_size=2)
+
+    urls = await asyncio.gather(*(upload.upload(make_upload(b"fresh banner", f"{i}.png")) for i in range(5)))
+
+    assert len(set(urls)) == 1
+    assert (tmp_path / ".content-index").read_text().count("\n") == 1
@@ -0,0 +1,68 @@
+import pytest
+
+from httpx import AsyncClient
+from app.auth.identity_cache import identity_cache
+from app.auth.jwt import create_access_token
+from app.database.models import User
+
+
+@pytest.mark.asyncio
+async def test_identity_cache_counts_hits(client: AsyncClient):
+    user = await User.create(telegram=515151, first_name="Admin")
+    token = create_access_token({"sub": str(user.id)})
+    headers = {"Authorization": f"Bearer {token}"}
+
+    await client.get("/admin/diagnostics/cache", headers=headers)
+    response = await client.get("/admin/diagnostics/cache", headers=headers)
+
+    assert response.status_code == 200
+    stat = response.json()["identityCache"]
+    assert stat["misses"] == 1
+    assert stat["hits"] == 1
+    assert stat["size"] == 1
+
+
+@pytest.mark.asyncio
+async def test_identity_cache_invalidated_on_user_delete(client: AsyncClient):
+    admin = await User.create(telegram=525252, first_name="Admin")
+    victim = await User.create(telegram=535353, first_name="Victim")
+    admin_headers = {"Authorization": f"Bearer {create_access_token({'sub': str(admin.id)})}"}
+    victim_headers = {"Authorization": f"Bearer {create_access_token({'sub': str(victim.id)})}"}
+
+    response = await client.get("/admin/diagnostics/cache", headers=victim_headers)
+    assert response.status_code == 200
+
+    response = await client.delete(f"/admin/users/{victim.id}", headers=admin_headers)
+    assert response.status_code == 200
+
+    response = await client.get("/admin/diagnostics/cache", headers=victim_headers)
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_identity_cache_returns_a_fresh_user_per_hit():
+    user = await User.create(telegram=545454, first_name="Admin")
+    identity_cache.set("token", user)
+
+    first = identity_cache.get("token", user.id)
+    second = identity_cache.get("token", user.id)
+
+    assert first is not second
+    assert first is not user
+    assert (first.id, first.telegram, first.first_name) == (user.id, user.telegram, user.first_name)
+
+    first.first_name = "Changed"
+    assert identity_cache.get("token", user.id).first_name == "Admin"
+
+    identity_cache.clear()
+    assert identity_cache.stats()["hits"] == 0
+    assert identity_cache.stats()["misses"] == 0
+
+
+@pytest.mark.asyncio
+async def test_identity_cache_is_keyed_by_token_and_sub():
+    user = await User.create(telegram=555555, first_name="Admin")
+    identity_cache.set("token", user)
+
+    assert identity_cache.get("token", user.id + 1) is None
+    assert identity_cache.get("token", user.id) is not None
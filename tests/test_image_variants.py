@@ -0,0 +1,44 @@
+import pytest
+
+from PIL import Image
+
+from app.services.image_variants import ImageVariantPipeline, render_variants
+
+
+@pytest.mark.asyncio
+async def test_variants_are_resized_webp_copies(tmp_path):
+    Image.new("RGB", (2000, 1000), "red").save(tmp_path / "banner.png")
+    pipeline = ImageVariantPipeline(max_workers=1)
+
+    try:
+        variants = await pipeline.generate(str(tmp_path), "banner.png")
+    finally:
+        pipeline.shutdown()
+
+    assert variants == {
+        "thumbnail": "banner.thumbnail.webp",
+        "medium": "banner.medium.webp",
+        "webp": "banner.webp.webp",
+    }
+    assert (tmp_path / "banner.png").exists()
+    with Image.open(tmp_path / "banner.thumbnail.webp") as thumbnail:
+        assert thumbnail.format == "WEBP"
+        assert thumbnail.size == (320, 160)
+    with Image.open(tmp_path / "banner.webp.webp") as full:
+        assert full.size == (2000, 1000)
+
+
+@pytest.mark.asyncio
+async def test_non_images_have_no_variants(tmp_path):
+    (tmp_path / "rules.pdf").write_bytes(b"%PDF")
+    pipeline = ImageVariantPipeline(max_workers=1)
+
+    assert await pipeline.generate(str(tmp_path), "rules.pdf") == {}
+    assert pipeline._executor is None
+
+
+def test_oversized_images_have_no_variants(tmp_path):
+    Image.new("RGB", (200, 100), "red").save(tmp_path / "huge.png")
+
+    assert render_variants(str(tmp_path), "huge.png", max_pixels=10_000) == {}
+    assert render_variants(str(tmp_path), "huge.png", max_pixels=20_000) != {}
@@ -0,0 +1,30 @@
+import time
+import pytest
+
+from app.auth.init_data import ExpiredInitData, InitDataValidator
+
+USER = "%7B%22id%22%3A42%2C%22first_name%22%3A%22Replay%22%7D"
+
+
+@pytest.mark.asyncio
+async def test_repeated_init_data_is_not_reverified():
+    validator = InitDataValidator(bot_token="123:abc", max_age=3600, cache_size=10)
+    init_data = f"query_id=AAAA1&user={USER}&auth_date={int(time.time())}&hash=replayhash"
+
+    first = validator.validate(init_data)
+    second = validator.validate(init_data)
+
+    assert first.user.id == 42
+    assert second is first
+    assert InitDataValidator.check_signature.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_stale_init_data_is_rejected_before_signature_check():
+    validator = InitDataValidator(bot_token="123:abc", max_age=60, cache_size=10)
+    init_data = f"query_id=AAAA1&user={USER}&auth_date={int(time.time()) - 120}&hash=stalehash"
+
+    with pytest.raises(ExpiredInitData):
+        validator.validate(init_data)
+
+    assert InitDataValidator.check_signature.call_count == 0
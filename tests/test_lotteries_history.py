@@ -48,3 +48,32 @@ async def test_lottery_history_returns_only_past_lotteries(client: AsyncClient):
     now_ts = int(now.timestamp())
     for lottery in data["lotteries"]:
         assert lottery["eventDate"] < now_ts
+
+
+@pytest.mark.asyncio
+async def test_lottery_history_cursor_pagination(client: AsyncClient):
+    user = await User.create(telegram=445, first_name="CursorTester")
+    token = create_access_token({"sub": str(user.id)})
+    now = datetime.now(timezone.utc)
+
+    for i in range(5):
+        await Lottery.create(
+            name=f"Прошедший {i}",
+            banner="b", short_description="s", total_sum=100,
+            event_date=now - timedelta(days=i + 1), is_active=False,
+            collection_name="col", collection_address="addr", collection_banner="cb",
+            ticket_price=10.0
+        )
+
+    seen = []
+    cursor = None
+    for _ in range(3):
+        url = "/lotteries/history?limit=2" + (f"&cursor={cursor}" if cursor else "")
+        response = await client.get(url, headers={"Authorization": f"Bearer {token}"})
+        assert response.status_code == 200
+        data = response.json()
+        seen.extend(l["name"] for l in data["lotteries"])
+        cursor = data["nextCursor"]
+
+    assert seen == [f"Прошедший {i}" for i in range(5)]
+    assert cursor is None
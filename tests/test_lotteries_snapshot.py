@@ -0,0 +1,42 @@
+import pytest
+
+from datetime import datetime, timedelta, timezone
+from httpx import AsyncClient
+
+from app.auth.jwt import create_access_token
+from app.database.models import User, Lottery
+
+
+@pytest.mark.asyncio
+async def test_active_lottery_snapshot_is_invalidated_by_set_active(client: AsyncClient):
+    user = await User.create(telegram=717171, first_name="Snapshot")
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': str(user.id)})}"}
+    now = datetime.now(timezone.utc)
+
+    first = await Lottery.create(
+        name="First", banner="b", short_description="s", total_sum=100,
+        event_date=now + timedelta(hours=1), is_active=True,
+        collection_name="col", collection_address="addr", collection_banner="cb",
+        ticket_price=10.0
+    )
+    second = await Lottery.create(
+        name="Second", banner="b", short_description="s", total_sum=100,
+        event_date=now + timedelta(hours=2), is_active=False,
+        collection_name="col", collection_address="addr", collection_banner="cb",
+        ticket_price=10.0
+    )
+
+    response = await client.get("/lotteries", headers=headers)
+    assert response.status_code == 200
+    lottery = response.json()["lottery"]
+    assert lottery["id"] == first.id
+    assert 3500 <= lottery["remainingSeconds"] <= 3600
+
+    response = await client.put(f"/admin/lotteries/setActive/{second.id}", headers=headers)
+    assert response.status_code == 200
+
+    response = await client.get("/lotteries", headers=headers)
+    assert response.status_code == 200
+    lottery = response.json()["lottery"]
+    assert lottery["id"] == second.id
+    assert 7100 <= lottery["remainingSeconds"] <= 7200
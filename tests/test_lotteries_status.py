@@ -1,8 +1,9 @@
 import pytest
 
+from datetime import datetime, timedelta, timezone
 from httpx import AsyncClient
 
-from app.database.models import User
+from app.database.models import Lottery, Option, User
 from app.database.models.user_profile import UserProfile
 from app.auth.jwt import create_access_token
 
@@ -24,3 +25,25 @@ async def test_check_live_status_response(client: AsyncClient):
 
     assert data["status"] == "offline"
     assert data["liveLink"] is None
+
+
+@pytest.mark.asyncio
+async def test_live_status_follows_change_events(client: AsyncClient):
+    user = await User.create(telegram=123457, first_name="Streamer")
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': str(user.id)})}"}
+    await Option.create(title="Live status", key="liveStatus", value="0")
+    await Lottery.create(
+        name="Live", banner="b", short_description="s", total_sum=100,
+        event_date=datetime.now(timezone.utc) + timedelta(days=1), is_active=True,
+        collection_name="col", collection_address="addr", collection_banner="cb",
+        ticket_price=10.0
+    )
+
+    response = await client.get("/lotteries/status", headers=headers)
+    assert response.json()["status"] == "offline"
+
+    response = await client.put("/admin/changeLiveStatus", json={"liveLink": "https://t.me/live"}, headers=headers)
+    assert response.status_code == 200
+
+    response = await client.get("/lotteries/status", headers=headers)
+    assert response.json()["status"] == "online"
@@ -0,0 +1,93 @@
+import asyncio
+import pytest
+
+from datetime import datetime, timedelta, timezone
+from httpx import AsyncClient
+from tortoise.transactions import in_transaction
+
+from app.auth.jwt import create_access_token
+from app.database.models import User, Lottery, Ticket, Prize, LotteryPrizes, LotteryCounters
+from app.services.counters_service import reconcile_counters, refresh_counters
+from app.services.lottery_service import assign_prize
+
+
+async def create_lottery() -> Lottery:
+    return await Lottery.create(
+        name="Counters", banner="b", short_description="s", total_sum=100,
+        event_date=datetime.now(timezone.utc) + timedelta(days=1), is_active=True,
+        collection_name="col", collection_address="addr", collection_banner="cb",
+        ticket_price=10.0
+    )
+
+
+@pytest.mark.asyncio
+async def test_buy_nft_updates_counters(client: AsyncClient):
+    user = await User.create(telegram=616161, first_name="Buyer")
+    token = create_access_token({"sub": str(user.id)})
+    lottery = await create_lottery()
+    tickets = [
+        await Ticket.create(lottery=lottery, number=i, name="n", image="i", address="a")
+        for i in range(1, 4)
+    ]
+    async with in_transaction() as connection:
+        await refresh_counters([lottery.id], connection)
+
+    for ticket in tickets[:2]:
+        response = await client.post(f"/users/buy/{ticket.id}", headers={"Authorization": f"Bearer {token}"})
+        assert response.status_code == 200
+
+    counters = await LotteryCounters.get(lottery_id=lottery.id)
+    assert counters.ticket_count == 3
+    assert counters.sold_count == 2
+    assert counters.participants == 1
+    assert float(counters.revenue) == 20.0
+
+
+@pytest.mark.asyncio
+async def test_assign_prize_updates_counters_and_reconcile_reports_drift():
+    user = await User.create(telegram=626262, first_name="Winner")
+    lottery = await create_lottery()
+    prizes = [
+        await Prize.create(title=f"P{i}", type="nft", description="d", quantity=1, image="i")
+        for i in range(2)
+    ]
+    for prize in prizes:
+        await LotteryPrizes.create(lottery=lottery, prize=prize)
+    async with in_transaction() as connection:
+        await refresh_counters([lottery.id], connection)
+
+    await assign_prize(user.id, prizes[0].id)
+
+    counters = await LotteryCounters.get(lottery_id=lottery.id)
+    assert counters.total_nft_count == 2
+    assert counters.available_nft_count == 1
+    assert await reconcile_counters([lottery.id]) == []
+
+    await Ticket.create(lottery=lottery, number=1, name="n", image="i", address="a")
+    drift = await reconcile_counters([lottery.id])
+
+    assert drift == [{"lottery_id": lottery.id, "field": "ticket_count", "stored": 0, "expected": 1}]
+    counters = await LotteryCounters.get(lottery_id=lottery.id)
+    assert counters.ticket_count == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_buys_by_one_user_count_one_participant(client: AsyncClient):
+    user = await User.create(telegram=616162, first_name="Buyer")
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': str(user.id)})}"}
+    lottery = await create_lottery()
+    tickets = [
+        await Ticket.create(lottery=lottery, number=i, name="n", image="i", address="a")
+        for i in range(1, 11)
+    ]
+    async with in_transaction() as connection:
+        await refresh_counters([lottery.id], connection)
+
+    responses = await asyncio.gather(*[
+        client.post(f"/users/buy/{t.id}", headers=headers) for t in tickets
+    ])
+
+    assert all(r.status_code == 200 for r in responses)
+    counters = await LotteryCounters.get(lottery_id=lottery.id)
+    assert counters.sold_count == 10
+    assert counters.participants == 1
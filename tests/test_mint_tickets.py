@@ -0,0 +1,93 @@
+import json
+import pytest
+
+from datetime import datetime, timedelta, timezone
+from httpx import AsyncClient
+
+from app.auth.jwt import create_access_token
+from app.database.models import User, Lottery, Ticket
+from app.services.counters_service import get_counters
+
+
+@pytest.mark.asyncio
+async def test_mint_tickets_from_template(client: AsyncClient):
+    admin = await User.create(telegram=950001, first_name="Admin")
+    lottery = await Lottery.create(
+        name="Mint", banner="b", short_description="s", total_sum=100,
+        event_date=datetime.now(timezone.utc) + timedelta(days=1), is_active=True,
+        collection_name="col", collection_address="addr", collection_banner="cb",
+        ticket_price=10.0
+    )
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': str(admin.id)})}"}
+    template = json.dumps({"name": "Ticket #{number}", "image": "img/{number}.png", "address": "TON{number}"})
+
+    response = await client.post(
+        f"/admin/lotteries/{lottery.id}/tickets/mint",
+        json={"count": 2500, "template": template},
+        headers=headers
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["minted"] == 2500
+    assert data["firstNumber"] == 1
+    assert data["lastNumber"] == 2500
+
+    ticket = await Ticket.get(lottery=lottery, number=42)
+    assert ticket.name == "Ticket #42"
+    assert ticket.image == "img/42.png"
+    assert ticket.address == "TON42"
+
+    response = await client.post(
+        f"/admin/lotteries/{lottery.id}/tickets/mint",
+        json={"count": 10},
+        headers=headers
+    )
+    assert response.json()["firstNumber"] == 2501
+
+    assert await Ticket.filter(lottery=lottery).count() == 2510
+    counters = await get_counters(lottery.id)
+    assert counters.ticket_count == 2510
+
+
+@pytest.mark.asyncio
+async def test_mint_tickets_rejects_invalid_template(client: AsyncClient):
+    admin = await User.create(telegram=950002, first_name="Admin")
+    lottery = await Lottery.create(
+        name="Broken", banner="b", short_description="s", total_sum=100,
+        event_date=datetime.now(timezone.utc) + timedelta(days=1), is_active=True,
+        collection_name="col", collection_address="addr", collection_banner="cb",
+        ticket_price=10.0
+    )
+
+    response = await client.post(
+        f"/admin/lotteries/{lottery.id}/tickets/mint",
+        json={"count": 10, "template": "not json"},
+        headers={"Authorization": f"Bearer {create_access_token({'sub': str(admin.id)})}"}
+    )
+
+    assert response.status_code == 400
+    assert await Ticket.filter(lottery=lottery).count() == 0
+
+
+@pytest.mark.asyncio
+async def test_mint_tickets_rejects_overlong_template_without_saving_it(client: AsyncClient):
+    admin = await User.create(telegram=950003, first_name="Admin")
+    lottery = await Lottery.create(
+        name="Long", banner="b", short_description="s", total_sum=100,
+        event_date=datetime.now(timezone.utc) + timedelta(days=1), is_active=True,
+        collection_name="col", collection_address="addr", collection_banner="cb",
+        ticket_price=10.0, ticket_template=json.dumps({"name": "Ticket #{number}"})
+    )
+    template = json.dumps({"name": "x" * 250 + "#{number}"})
+
+    response = await client.post(
+        f"/admin/lotteries/{lottery.id}/tickets/mint",
+        json={"count": 100000, "template": template},
+        headers={"Authorization": f"Bearer {create_access_token({'sub': str(admin.id)})}"}
+    )
+
+    assert response.status_code == 400
+    assert await Ticket.filter(lottery=lottery).count() == 0
+    await lottery.refresh_from_db()
+    assert lottery.ticket_template == json.dumps({"name": "Ticket #{number}"})
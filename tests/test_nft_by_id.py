@@ -61,3 +61,112 @@ async def test_lottery_nfts_returns_correct_count(client: AsyncClient):
 
         assert isinstance(nft["ticketNumber"], int)
         assert nft["address"].startswith("TON")
+
+
+@pytest.mark.asyncio
+async def test_lottery_nfts_after_number_cursor(client: AsyncClient):
+    user = await User.create(telegram=778, first_name="CursorTester")
+    token = create_access_token({"sub": str(user.id)})
+
+    lottery = await Lottery.create(
+        name="Cursor", banner="b", short_description="s", total_sum=1000,
+        event_date=datetime.now(timezone.utc) + timedelta(days=1), is_active=True,
+        collection_name="col", collection_address="addr", collection_banner="cb",
+        ticket_price=12.5
+    )
+
+    for number in (5, 3, 1, 4, 2):
+        await Ticket.create(
+            lottery=lottery, number=number, name=f"NFT #{number}",
+            image="https://example.com/image.png", address=f"TON{number}"
+        )
+
+    response = await client.get(
+        f"/lotteries/nfts/{lottery.id}?limit=2&after_number=1&with_total=false",
+        headers={"Authorization": f"Bearer {token}"}
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [nft["ticketNumber"] for nft in data["nfts"]] == [2, 3]
+    assert data["nextAfterNumber"] == 3
+    assert data["totalPages"] is None
+
+    response = await client.get(
+        f"/lotteries/nfts/{lottery.id}?limit=2&after_number=3",
+        headers={"Authorization": f"Bearer {token}"}
+    )
+
+    data = response.json()
+    assert [nft["ticketNumber"] for nft in data["nfts"]] == [4, 5]
+    assert data["nextAfterNumber"] is None
+    assert data["totalPages"] == 3
+
+
+@pytest.mark.asyncio
+async def test_lottery_nfts_only_available(client: AsyncClient):
+    user = await User.create(telegram=779, first_name="AvailableTester")
+    token = create_access_token({"sub": str(user.id)})
+    headers = {"Authorization": f"Bearer {token}"}
+
+    lottery = await Lottery.create(
+        name="Available", banner="b", short_description="s", total_sum=1000,
+        event_date=datetime.now(timezone.utc) + timedelta(days=1), is_active=True,
+        collection_name="col", collection_address="addr", collection_banner="cb",
+        ticket_price=12.5
+    )
+
+    tickets = {}
+    for number in range(1, 7):
+        tickets[number] = await Ticket.create(
+            lottery=lottery, number=number, name=f"NFT #{number}",
+            image="https://example.com/image.png", address=f"TON{number}",
+            owner=user if number == 2 else None
+        )
+
+    response = await client.get(
+        f"/lotteries/nfts/{lottery.id}?only_available=true&limit=3",
+        headers=headers
+    )
+    data = response.json()
+    assert [nft["ticketNumber"] for nft in data["nfts"]] == [1, 3, 4]
+    assert all(nft["buyAvailable"] for nft in data["nfts"])
+    assert data["totalPages"] == 2
+    assert data["nextAfterNumber"] == 4
+
+    response = await client.post(f"/users/buy/{tickets[5].id}", headers=headers)
+    assert response.status_code == 200
+
+    response = await client.get(
+        f"/lotteries/nfts/{lottery.id}?only_available=true&after_number=4&min_number=1&max_number=6",
+        headers=headers
+    )
+    data = response.json()
+    assert [nft["ticketNumber"] for nft in data["nfts"]] == [6]
+    assert data["totalPages"] == 1
+
+
+@pytest.mark.asyncio
+async def test_lottery_nfts_expired_reservation_is_buy_available(client: AsyncClient):
+    user = await User.create(telegram=780, first_name="ExpiredTester")
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': str(user.id)})}"}
+
+    lottery = await Lottery.create(
+        name="Expired", banner="b", short_description="s", total_sum=1000,
+        event_date=datetime.now(timezone.utc) + timedelta(days=1), is_active=True,
+        collection_name="col", collection_address="addr", collection_banner="cb",
+        ticket_price=12.5
+    )
+    now = datetime.now(timezone.utc)
+    for number, expires_at in ((1, now - timedelta(minutes=1)), (2, now + timedelta(minutes=10))):
+        await Ticket.create(
+            lottery=lottery, number=number, name=f"NFT #{number}",
+            image="https://example.com/image.png", address=f"TON{number}",
+            owner=user, expires_at=expires_at
+        )
+
+    for query in ("only_available=true", "only_available=false"):
+        response = await client.get(f"/lotteries/nfts/{lottery.id}?{query}", headers=headers)
+        available = {nft["ticketNumber"]: nft["buyAvailable"] for nft in response.json()["nfts"]}
+        assert available[1] is True
+        assert available.get(2, False) is False
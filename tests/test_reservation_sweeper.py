@@ -0,0 +1,59 @@
+import pytest
+
+from datetime import datetime, timedelta, timezone
+from httpx import AsyncClient
+from tortoise.transactions import in_transaction
+
+from app.auth.jwt import create_access_token
+from app.database.models import User, Lottery, Ticket
+from app.services.counters_service import get_counters, refresh_counters
+from app.services.reservation_sweeper import ReservationSweeper
+from app.services.ticket_availability import ticket_availability
+
+
+@pytest.mark.asyncio
+async def test_sweep_releases_expired_reservations_in_batches(client: AsyncClient):
+    owner = await User.create(telegram=920001, first_name="Slow")
+    lottery = await Lottery.create(
+        name="Sweep", banner="b", short_description="s", total_sum=100,
+        event_date=datetime.now(timezone.utc) + timedelta(days=1), is_active=True,
+        collection_name="col", collection_address="addr", collection_banner="cb",
+        ticket_price=10.0
+    )
+    now = datetime.now(timezone.utc)
+    await Ticket.bulk_create([
+        Ticket(
+            lottery=lottery, number=i, name=f"NFT #{i}", image="img", address=f"TON{i}",
+            owner=owner, expires_at=now - timedelta(minutes=1) if i <= 5 else now + timedelta(minutes=10)
+        )
+        for i in range(1, 8)
+    ])
+    async with in_transaction() as connection:
+        await refresh_counters([lottery.id], connection)
+    availability = await ticket_availability.get(lottery.id)
+
+    sweeper = ReservationSweeper(interval=1, batch_size=2, max_batches=10)
+    released = await sweeper.sweep()
+
+    assert released == 5
+    assert await Ticket.filter(lottery=lottery, owner_id=None).count() == 5
+    assert await Ticket.filter(lottery=lottery, owner=owner).count() == 2
+    assert availability.is_available(1)
+    assert not availability.is_available(6)
+
+    counters = await get_counters(lottery.id)
+    assert counters.sold_count == 2
+
+    stats = sweeper.stats()
+    assert stats["sweeps"] == 1
+    assert stats["last_released"] == 5
+    assert stats["total_released"] == 5
+
+    assert await sweeper.sweep() == 0
+
+    response = await client.get(
+        "/admin/diagnostics/sweeper",
+        headers={"Authorization": f"Bearer {create_access_token({'sub': str(owner.id)})}"}
+    )
+    assert response.status_code == 200
+    assert "lastReleased" in response.json()["sweeper"]
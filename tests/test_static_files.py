@@ -0,0 +1,77 @@
+import gzip
+import hashlib
+import io
+import pytest
+
+from httpx import AsyncClient, ASGITransport
+from starlette.applications import Starlette
+from starlette.datastructures import UploadFile
+from starlette.routing import Mount
+
+from app.services.file_upload import FileUpload
+from app.services.static_files import UploadsStaticFiles
+
+
+def uploads_client(directory) -> AsyncClient:
+    app = Starlette(routes=[Mount("/uploads", UploadsStaticFiles(directory=str(directory)))])
+    return AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+
+
+@pytest.mark.asyncio
+async def test_hashed_uploads_are_immutable_and_revalidate_to_304(tmp_path):
+    name = f"{hashlib.sha256(b'banner').hexdigest()}.png"
+    (tmp_path / name).write_bytes(b"banner")
+
+    async with uploads_client(tmp_path) as client:
+        response = await client.get(f"/uploads/{name}")
+        assert response.status_code == 200
+        assert "immutable" in response.headers["cache-control"]
+        etag = response.headers["etag"]
+        assert not etag.startswith("W/")
+
+        response = await client.get(f"/uploads/{name}", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+
+
+@pytest.mark.asyncio
+async def test_plain_uploads_revalidate_when_file_changes(tmp_path):
+    (tmp_path / "rules.txt").write_text("v1")
+
+    async with uploads_client(tmp_path) as client:
+        first = await client.get("/uploads/rules.txt")
+        assert first.headers["cache-control"] == "public, no-cache"
+
+        (tmp_path / "rules.txt").write_text("v22")
+        second = await client.get("/uploads/rules.txt", headers={"If-None-Match": first.headers["etag"]})
+        assert second.status_code == 200
+        assert second.text == "v2"
+
+
+@pytest.mark.asyncio
+async def test_precompressed_sibling_is_served_when_accepted(tmp_path):
+    content = b"{}" * 1000
+    (tmp_path / "data.json").write_bytes(content)
+    (tmp_path / "data.json.gz").write_bytes(gzip.compress(content))
+
+    async with uploads_client(tmp_path) as client:
+        response = await client.get("/uploads/data.json", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["content-type"].startswith("application/json")
+        assert response.content == content
+
+        response = await client.get("/uploads/data.json", headers={"Accept-Encoding": "br;q=0, identity"})
+        assert "content-encoding" not in response.headers
+        assert response.headers["vary"] == "Accept-Encoding"
+
+
+@pytest.mark.asyncio
+async def test_upload_index_and_partial_files_are_not_served(tmp_path):
+    upload = FileUpload(uploads_dir=str(tmp_path), prefix="/uploads/", content_addressed=True)
+    await upload.upload(UploadFile(file=io.BytesIO(b"banner"), filename="banner.png"))
+    (tmp_path / "tmpabc.part").write_bytes(b"half")
+
+    async with uploads_client(tmp_path) as client:
+        assert (tmp_path / ".content-index").exists()
+        assert (await client.get("/uploads/.content-index")).status_code == 404
+        assert (await client.get("/uploads/tmpabc.part")).status_code == 404
@@ -0,0 +1,43 @@
+import asyncio
+import pytest
+
+from datetime import datetime, timedelta, timezone
+
+from app.database.models import Lottery, Ticket
+from app.services.ticket_availability import ticket_availability
+
+
+@pytest.mark.asyncio
+async def test_changes_during_load_are_applied_to_loaded_bitmap(monkeypatch):
+    lottery = await Lottery.create(
+        name="Bitmap", banner="b", short_description="s", total_sum=100,
+        event_date=datetime.now(timezone.utc) + timedelta(days=1), is_active=True,
+        collection_name="col", collection_address="addr", collection_banner="cb",
+        ticket_price=10.0
+    )
+    await Ticket.bulk_create([
+        Ticket(lottery=lottery, number=n, name=f"T{n}", image="i", address="a")
+        for n in range(1, 4)
+    ])
+
+    started = asyncio.Event()
+    release = asyncio.Event()
+    original_load = ticket_availability._load
+
+    async def stalled_load(lottery_id: int):
+        bitmap = await original_load(lottery_id)
+        started.set()
+        await release.wait()
+        return bitmap
+
+    monkeypatch.setattr(ticket_availability, "_load", stalled_load)
+
+    loading = asyncio.create_task(ticket_availability.get(lottery.id))
+    await started.wait()
+    ticket_availability.mark_taken(lottery.id, [2])
+    release.set()
+    bitmap = await loading
+
+    assert bitmap.available_numbers() == [1, 3]
+    assert await ticket_availability.get(lottery.id) is bitmap
+    assert lottery.id not in ticket_availability._locks
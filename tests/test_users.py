@@ -1,8 +1,9 @@
+import asyncio
 import time
 import pytest
 
 from httpx import AsyncClient
-from app.database.models import User
+from app.database.models import User, UserProfile
 
 VALID_INIT_DATA = f"query_id=AAAA1&user=%7B%22id%22%3A123456789%2C%22first_name%22%3A%22Test%22%2C%22last_name%22%3A%22User%22%2C%22username%22%3A%22testuser%22%2C%22photo_url%22%3A%22https%3A%2F%2Ft.me%2Fphoto.jpg%22%7D&auth_date={int(time.time())}&hash=securehash"
 
@@ -44,4 +45,17 @@ async def test_login_does_not_create_duplicate_user(client: AsyncClient):
 
     user = users[0]
     await user.fetch_related("profile")
-    assert user.profile is not None
\ No newline at end of file
+    assert user.profile is not None
+
+@pytest.mark.asyncio
+async def test_concurrent_logins_create_single_user_and_profile(client: AsyncClient):
+    responses = await asyncio.gather(*[
+        client.post("/users/loginByInitData", data={"init_data": VALID_INIT_DATA})
+        for _ in range(20)
+    ])
+
+    assert all(r.status_code == 200 for r in responses)
+    assert len({r.json()["user"]["id"] for r in responses}) == 1
+
+    assert await User.filter(telegram=123456789).count() == 1
+    assert await UserProfile.filter(user__telegram=123456789).count() == 1
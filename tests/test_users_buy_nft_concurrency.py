@@ -0,0 +1,64 @@
+import asyncio
+import pytest
+
+from datetime import datetime, timedelta, timezone
+from httpx import AsyncClient
+
+from app.auth.jwt import create_access_token
+from app.database.models import User, Lottery, Ticket
+
+BUYERS = 200
+
+
+@pytest.mark.asyncio
+async def test_concurrent_buys_of_one_ticket_have_a_single_winner(client: AsyncClient):
+    await User.bulk_create([User(telegram=900000 + i, first_name=f"Buyer {i}") for i in range(BUYERS)])
+    users = await User.filter(telegram__gte=900000, telegram__lt=900000 + BUYERS)
+    tokens = [create_access_token({"sub": str(u.id)}) for u in users]
+
+    lottery = await Lottery.create(
+        name="FlashSale", banner="b", short_description="s", total_sum=100,
+        event_date=datetime.now(timezone.utc) + timedelta(days=1), is_active=True,
+        collection_name="col", collection_address="addr", collection_banner="cb",
+        ticket_price=10.0
+    )
+    ticket = await Ticket.create(lottery=lottery, number=1, name="NFT #1", image="img", address="TON1")
+
+    responses = await asyncio.gather(*[
+        client.post(f"/users/buy/{ticket.id}", headers={"Authorization": f"Bearer {token}"})
+        for token in tokens
+    ])
+
+    statuses = [r.status_code for r in responses]
+    assert statuses.count(200) == 1
+    assert statuses.count(403) == BUYERS - 1
+
+    winner = users[statuses.index(200)]
+    await ticket.refresh_from_db()
+    assert ticket.owner_id == winner.id
+
+
+@pytest.mark.asyncio
+async def test_buy_nft_takes_over_expired_reservation(client: AsyncClient):
+    first = await User.create(telegram=910001, first_name="Late")
+    second = await User.create(telegram=910002, first_name="Next")
+
+    lottery = await Lottery.create(
+        name="Expired", banner="b", short_description="s", total_sum=100,
+        event_date=datetime.now(timezone.utc) + timedelta(days=1), is_active=True,
+        collection_name="col", collection_address="addr", collection_banner="cb",
+        ticket_price=10.0
+    )
+    ticket = await Ticket.create(
+        lottery=lottery, number=1, name="NFT #1", image="img", address="TON1",
+        owner=first, expires_at=datetime.now(timezone.utc) - timedelta(minutes=1)
+    )
+
+    response = await client.post(
+        f"/users/buy/{ticket.id}",
+        headers={"Authorization": f"Bearer {create_access_token({'sub': str(second.id)})}"}
+    )
+
+    assert response.status_code == 200
+    await ticket.refresh_from_db()
+    assert ticket.owner_id == second.id
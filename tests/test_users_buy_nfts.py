@@ -0,0 +1,66 @@
+import pytest
+
+from datetime import datetime, timedelta, timezone
+from httpx import AsyncClient
+from tortoise.transactions import in_transaction
+
+from app.auth.jwt import create_access_token
+from app.database.models import User, Lottery, Ticket
+from app.services.counters_service import get_counters, refresh_counters
+
+
+@pytest.mark.asyncio
+async def test_bulk_buy_reserves_available_tickets(client: AsyncClient):
+    buyer = await User.create(telegram=940001, first_name="Whale")
+    other = await User.create(telegram=940002, first_name="Other")
+    lottery = await Lottery.create(
+        name="Bulk", banner="b", short_description="s", total_sum=100,
+        event_date=datetime.now(timezone.utc) + timedelta(days=1), is_active=True,
+        collection_name="col", collection_address="addr", collection_banner="cb",
+        ticket_price=10.0
+    )
+    free = [
+        await Ticket.create(lottery=lottery, number=i, name=f"NFT #{i}", image="img", address=f"TON{i}")
+        for i in range(1, 4)
+    ]
+    taken = await Ticket.create(
+        lottery=lottery, number=4, name="NFT #4", image="img", address="TON4",
+        owner=other, expires_at=datetime.now(timezone.utc) + timedelta(minutes=10)
+    )
+    async with in_transaction() as connection:
+        await refresh_counters([lottery.id], connection)
+
+    ticket_ids = [t.id for t in free] + [taken.id, free[0].id]
+    response = await client.post(
+        "/users/buy",
+        json={"ticketIds": ticket_ids},
+        headers={"Authorization": f"Bearer {create_access_token({'sub': str(buyer.id)})}"}
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["success"] is True
+    assert data["paymentLink"]
+    assert [t["ticketId"] for t in data["tickets"]] == [t.id for t in free] + [taken.id]
+    assert [t["reserved"] for t in data["tickets"]] == [True, True, True, False]
+
+    assert await Ticket.filter(lottery=lottery, owner=buyer).count() == 3
+    counters = await get_counters(lottery.id)
+    assert counters.sold_count == 4
+
+
+@pytest.mark.asyncio
+async def test_bulk_buy_with_nothing_available(client: AsyncClient):
+    buyer = await User.create(telegram=940003, first_name="Late")
+
+    response = await client.post(
+        "/users/buy",
+        json={"ticketIds": [999999]},
+        headers={"Authorization": f"Bearer {create_access_token({'sub': str(buyer.id)})}"}
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["success"] is False
+    assert data["paymentLink"] is None
+    assert data["tickets"] == [{"ticketId": 999999, "reserved": False, "number": None, "expiresAt": None}]
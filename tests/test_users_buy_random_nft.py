@@ -0,0 +1,76 @@
+import asyncio
+import pytest
+
+from datetime import datetime, timedelta, timezone
+from httpx import AsyncClient
+
+from app.auth.jwt import create_access_token
+from app.database.models import User, Lottery, Ticket
+
+COUNT = 3
+BUYERS = 40
+TICKETS = BUYERS * COUNT
+
+
+@pytest.mark.asyncio
+async def test_concurrent_random_buys_get_disjoint_tickets(client: AsyncClient):
+    await User.bulk_create([User(telegram=930000 + i, first_name=f"Buyer {i}") for i in range(BUYERS + 1)])
+    users = await User.filter(telegram__gte=930000, telegram__lte=930000 + BUYERS).order_by("telegram")
+    late_buyer = users.pop()
+
+    lottery = await Lottery.create(
+        name="Launch", banner="b", short_description="s", total_sum=100,
+        event_date=datetime.now(timezone.utc) + timedelta(days=1), is_active=True,
+        collection_name="col", collection_address="addr", collection_banner="cb",
+        ticket_price=10.0
+    )
+    await Ticket.bulk_create([
+        Ticket(lottery=lottery, number=i, name=f"NFT #{i}", image="img", address=f"TON{i}")
+        for i in range(1, TICKETS + 1)
+    ])
+
+    responses = await asyncio.gather(*[
+        client.post(
+            f"/users/buy/random/{lottery.id}?count={COUNT}",
+            headers={"Authorization": f"Bearer {create_access_token({'sub': str(u.id)})}"}
+        )
+        for u in users
+    ])
+
+    assert [r.status_code for r in responses] == [200] * BUYERS
+
+    numbers = []
+    for user, response in zip(users, responses):
+        bought = [t["number"] for t in response.json()["tickets"]]
+        assert len(bought) == COUNT
+        assert len(set(bought)) == COUNT
+        assert await Ticket.filter(lottery=lottery, owner=user).count() == COUNT
+        numbers.extend(bought)
+
+    assert len(set(numbers)) == len(numbers) == TICKETS
+    assert await Ticket.filter(lottery=lottery, owner_id__isnull=True).count() == 0
+
+    response = await client.post(
+        f"/users/buy/random/{lottery.id}",
+        headers={"Authorization": f"Bearer {create_access_token({'sub': str(late_buyer.id)})}"}
+    )
+    assert response.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_random_buy_without_free_tickets(client: AsyncClient):
+    user = await User.create(telegram=939999, first_name="Late")
+    lottery = await Lottery.create(
+        name="SoldOut", banner="b", short_description="s", total_sum=100,
+        event_date=datetime.now(timezone.utc) + timedelta(days=1), is_active=True,
+        collection_name="col", collection_address="addr", collection_banner="cb",
+        ticket_price=10.0
+    )
+    await Ticket.create(lottery=lottery, number=1, name="NFT #1", image="img", address="TON1", owner=user)
+
+    response = await client.post(
+        f"/users/buy/random/{lottery.id}",
+        headers={"Authorization": f"Bearer {create_access_token({'sub': str(user.id)})}"}
+    )
+
+    assert response.status_code == 403
@@ -0,0 +1,138 @@
+import asyncio
+import json
+import pytest
+
+from datetime import datetime, timezone
+from starlette.websockets import WebSocketState
+
+from app.database.models import User, Lottery, Prize, LotteryPrizes, UserPrizes
+from app.services.lottery_service import assign_prize
+from app.services.winners_hub import Subscriber, winners_hub
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.frames = []
+        self.client_state = WebSocketState.CONNECTED
+        self.application_state = WebSocketState.CONNECTED
+        self._incoming = asyncio.Queue()
+
+    async def send_text(self, text: str):
+        self.frames.append(json.loads(text))
+
+    async def receive(self):
+        return await self._incoming.get()
+
+    async def close(self):
+        self.application_state = WebSocketState.DISCONNECTED
+
+    def disconnect(self):
+        self.client_state = WebSocketState.DISCONNECTED
+        self._incoming.put_nowait({"type": "websocket.disconnect"})
+
+
+async def wait_for_frames(websocket: FakeWebSocket, count: int):
+    for _ in range(100):
+        if len(websocket.frames) >= count:
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"expected {count} frames, got {websocket.frames}")
+
+
+@pytest.mark.asyncio
+async def test_winners_are_loaded_once_per_change_and_fanned_out(monkeypatch):
+    user = await User.create(telegram=818181, first_name="Winner")
+    lottery = await Lottery.create(
+        name="Live", banner="b", short_description="s", total_sum=100,
+        event_date=datetime.now(timezone.utc), is_active=True,
+        collection_name="col", collection_address="addr", collection_banner="cb",
+        ticket_price=10.0
+    )
+    prize = await Prize.create(title="Grand", type="grand", description="d", quantity=1, image="i")
+    await LotteryPrizes.create(lottery=lottery, prize=prize)
+
+    loads = []
+    original_load = winners_hub._load
+
+    async def counting_load(lottery_id: int) -> str:
+        loads.append(lottery_id)
+        return await original_load(lottery_id)
+
+    monkeypatch.setattr(winners_hub, "_load", counting_load)
+
+    sockets = [FakeWebSocket() for _ in range(3)]
+    serving = [asyncio.create_task(winners_hub.serve(ws, lottery.id)) for ws in sockets]
+    for ws in sockets:
+        await wait_for_frames(ws, 1)
+
+    assert all(ws.frames[0] == {"type": "winner_update", "winners": []} for ws in sockets)
+    assert loads == [lottery.id]
+
+    await assign_prize(user.id, prize.id)
+    for ws in sockets:
+        await wait_for_frames(ws, 2)
+
+    expected = {"prize_id": prize.id, "title": "Grand", "user_id": user.id}
+    assert all(ws.frames[1]["winners"] == [expected] for ws in sockets)
+    assert loads == [lottery.id, lottery.id]
+
+    for ws in sockets:
+        ws.disconnect()
+    await asyncio.gather(*serving)
+    assert winners_hub.subscriber_count(lottery.id) == 0
+
+
+@pytest.mark.asyncio
+async def test_load_overlapping_notify_is_not_cached(monkeypatch):
+    user = await User.create(telegram=828282, first_name="Winner")
+    lottery = await Lottery.create(
+        name="Live", banner="b", short_description="s", total_sum=100,
+        event_date=datetime.now(timezone.utc), is_active=True,
+        collection_name="col", collection_address="addr", collection_banner="cb",
+        ticket_price=10.0
+    )
+    prize = await Prize.create(title="Grand", type="grand", description="d", quantity=1, image="i")
+    await LotteryPrizes.create(lottery=lottery, prize=prize)
+
+    started = asyncio.Event()
+    release = asyncio.Event()
+    original_load = winners_hub._load
+
+    async def stalled_load(lottery_id: int) -> str:
+        frame = await original_load(lottery_id)
+        if not started.is_set():
+            started.set()
+            await release.wait()
+        return frame
+
+    monkeypatch.setattr(winners_hub, "_load", stalled_load)
+
+    ws = FakeWebSocket()
+    serving = asyncio.create_task(winners_hub.serve(ws, lottery.id))
+    await started.wait()
+
+    await UserPrizes.create(user=user, prize=prize)
+    winners_hub.notify(lottery.id)
+    release.set()
+    await wait_for_frames(ws, 2)
+
+    expected = {"prize_id": prize.id, "title": "Grand", "user_id": user.id}
+    assert ws.frames[0]["winners"] == []
+    assert ws.frames[-1]["winners"] == [expected]
+    assert json.loads(winners_hub._frames[lottery.id])["winners"] == [expected]
+
+    ws.disconnect()
+    await serving
+    assert lottery.id not in winners_hub._generations
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_keeps_only_latest_frames():
+    subscriber = Subscriber(FakeWebSocket(), queue_size=2, send_timeout=1)
+
+    for i in range(5):
+        subscriber.offer(str(i))
+
+    assert subscriber.dropped == 3
+    assert subscriber._queue.get_nowait() == "3"
+    assert subscriber._queue.get_nowait() == "4"